@@ -0,0 +1,227 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+from synthetic import (
+    StubModel,
+    synthetic_articles,
+    synthetic_corpus,
+    synthetic_history,
+    synthetic_intent,
+)
+
+from music_of_the_day.mapping.semantics_to_intent import build_intent
+from music_of_the_day.music.ensemble import render_ensemble
+from music_of_the_day.music.render import render_tracks_to_wav
+from music_of_the_day.music.renderers.registry import get_renderers
+from music_of_the_day.semantics.features import (
+    cluster_topics,
+    compute_intra_day_dispersion,
+    extract_semantic_features,
+)
+
+PROFILES = {
+    "quick": {"articles": (10, 1_000), "durations": (75,), "repeats": 3},
+    "full": {
+        "articles": (10, 100, 1_000, 10_000, 100_000),
+        "durations": (75, 300, 1_200, 3_600),
+        "repeats": 3,
+    },
+}
+
+# Beyond these sizes a single run is long enough to be stable
+SINGLE_RUN_ARTICLES = 10_000
+SINGLE_RUN_SECONDS = 1_200
+
+# Sub-millisecond timings are reported but too noisy to fail a comparison
+NOISE_FLOOR_SECONDS = 0.001
+
+
+def _time(fn, repeats: int) -> dict:
+    """
+    Run fn `repeats` times; the minimum is the figure compared across
+    versions, the median shows how noisy the machine was.
+    """
+    times = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return {"min": min(times), "median": statistics.median(times), "repeats": repeats}
+
+
+def _stub_embedder(cache_dir: str):
+    """
+    An EmbeddingEngine backed by StubModel, or None if the embedding
+    stack cannot be imported here.
+    """
+    try:
+        from music_of_the_day.semantics import models
+        from music_of_the_day.semantics.embed import EmbeddingEngine
+    except ImportError as e:
+        print(f"⚠️ Skipping embed benchmarks: {e}")
+        return None
+    models.register_model("stub", StubModel())
+    return EmbeddingEngine(model_name="stub", cache_dir=cache_dir, device=None)
+
+
+def run_semantic_benchmarks(articles, repeats: int, results: dict, tmp_dir: str):
+    rolling = synthetic_history()
+    yesterday = synthetic_history(1, seed=2)[0]
+    embedder = _stub_embedder(str(Path(tmp_dir) / "embeddings"))
+
+    for n in articles:
+        corpus = synthetic_corpus(n)
+        daily = corpus.mean(axis=0)
+        reps = 1 if n >= SINGLE_RUN_ARTICLES else repeats
+        print(f"- semantics, {n} articles")
+
+        results[f"extract_semantic_features[n={n}]"] = _time(
+            lambda: extract_semantic_features(
+                corpus, daily, rolling_embeddings=rolling, embedding_yesterday=yesterday
+            ),
+            reps
+        )
+        results[f"cluster_topics[n={n}]"] = _time(
+            lambda: cluster_topics(corpus, 4), reps
+        )
+        results[f"compute_intra_day_dispersion[n={n}]"] = _time(
+            lambda: compute_intra_day_dispersion(corpus), reps
+        )
+        if embedder is not None and n <= SINGLE_RUN_ARTICLES:
+            texts = synthetic_articles(n)
+            results[f"embed_stub[n={n}]"] = _time(
+                lambda: embedder.embed(texts, use_cache=False), reps
+            )
+
+
+def run_music_benchmarks(
+    durations, repeats: int, results: dict, tmp_dir: str, wav_quality: str
+):
+    for seconds in durations:
+        intent = synthetic_intent(seconds)
+        reps = 1 if seconds >= SINGLE_RUN_SECONDS else repeats
+        print(f"- music, {seconds} s")
+
+        corpus = synthetic_corpus(200)
+        features = extract_semantic_features(corpus, corpus.mean(axis=0))
+        results[f"build_intent[s={seconds}]"] = _time(
+            lambda: build_intent(features, duration_seconds=seconds), repeats
+        )
+
+        for name, cls in get_renderers().items():
+            results[f"renderer.{name}[s={seconds}]"] = _time(
+                lambda: cls(seed=0).render(intent), repeats
+            )
+
+        midi_path = str(Path(tmp_dir) / f"bench_{seconds}.mid")
+        results[f"render_ensemble[s={seconds}]"] = _time(
+            lambda: render_ensemble(intent, midi_path, seed=0), repeats
+        )
+
+        tracks = render_ensemble(intent, midi_path, seed=0)
+        wav_path = str(Path(tmp_dir) / f"bench_{seconds}.wav")
+        results[f"render_wav.{wav_quality}[s={seconds}]"] = _time(
+            lambda: render_tracks_to_wav(tracks, wav_path, quality=wav_quality), reps
+        )
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Print current vs. baseline minimum times and return the benchmarks
+    that got slower than baseline * tolerance (above the noise floor).
+    """
+    regressions = []
+    print(f"{'benchmark':48s} {'baseline':>10s} {'current':>10s} {'ratio':>7s}")
+    for name, result in current["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:48s} {'-':>10s} {result['min']:10.4f}")
+            continue
+        ratio = result["min"] / base["min"] if base["min"] > 0 else float("inf")
+        flag = ""
+        if ratio > tolerance and result["min"] > NOISE_FLOOR_SECONDS:
+            regressions.append(name)
+            flag = "  ⚠️ slower"
+        print(
+            f"{name:48s} {base['min']:10.4f} {result['min']:10.4f} "
+            f"{ratio:7.2f}{flag}"
+        )
+    return regressions
+
+
+def main():
+    sys.stdout.reconfigure(encoding="utf-8")
+
+    parser = argparse.ArgumentParser(
+        description="Time the semantic and music stages on synthetic inputs."
+    )
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="quick")
+    parser.add_argument(
+        "--output", default="benchmarks/results.json", help="Where to write this run"
+    )
+    parser.add_argument("--baseline", help="Baseline JSON to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=1.25,
+        help="Fail when a benchmark is slower than baseline by more than this factor"
+    )
+    parser.add_argument("--wav-quality", choices=("preview", "full"), default="preview")
+    parser.add_argument(
+        "--only", choices=("semantics", "music"), help="Run one half of the suite"
+    )
+    args = parser.parse_args()
+
+    profile = PROFILES[args.profile]
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        if args.only != "music":
+            run_semantic_benchmarks(
+                profile["articles"], profile["repeats"], results, tmp_dir
+            )
+        if args.only != "semantics":
+            run_music_benchmarks(
+                profile["durations"],
+                profile["repeats"],
+                results,
+                tmp_dir,
+                args.wav_quality
+            )
+
+    report = {
+        "meta": {
+            "profile": args.profile,
+            "created": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"- Wrote {len(results)} results to {output}")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(
+                f"⚠️ {len(regressions)} benchmark(s) slower than "
+                f"{args.tolerance}x baseline"
+            )
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import hashlib
+
+import numpy as np
+
+from music_of_the_day.mapping.music_intent import MusicIntent
+from music_of_the_day.mapping.semantics_to_intent import build_intent
+from music_of_the_day.semantics.features import extract_semantic_features
+
+EMBEDDING_DIM = 768
+
+
+def synthetic_corpus(
+    n_articles: int,
+    dim: int = EMBEDDING_DIM,
+    n_topics: int = 8,
+    noise: float = 0.6,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    Unit-norm float32 article embeddings scattered around n_topics topic
+    directions, so clustering has real structure to find.
+    """
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(n_topics, dim))
+    labels = rng.integers(n_topics, size=n_articles)
+    x = topics[labels] + noise * rng.normal(size=(n_articles, dim))
+    x /= np.linalg.norm(x, axis=1, keepdims=True)
+    return x.astype(np.float32)
+
+
+def synthetic_history(
+    n_days: int = 14, dim: int = EMBEDDING_DIM, seed: int = 1
+) -> np.ndarray:
+    """
+    Daily mean embeddings for the rolling window.
+    """
+    return synthetic_corpus(n_days, dim, n_topics=2, noise=1.0, seed=seed)
+
+
+def synthetic_intent(duration_seconds: int, seed: int = 0) -> MusicIntent:
+    """
+    A MusicIntent built the way the pipeline builds one, from the features
+    of a small synthetic day.
+    """
+    corpus = synthetic_corpus(200, seed=seed)
+    features = extract_semantic_features(
+        corpus,
+        corpus.mean(axis=0),
+        rolling_embeddings=synthetic_history(),
+        embedding_yesterday=synthetic_history(1, seed=seed + 1)[0],
+        velocity_yesterday=0.2
+    )
+    return build_intent(features, duration_seconds=duration_seconds)
+
+
+def synthetic_articles(n_articles: int, seed: int = 0) -> list[str]:
+    rng = np.random.default_rng(seed)
+    words = [
+        "markets", "election", "storm", "talks",
+        "court", "league", "vaccine", "border",
+    ]
+    return [
+        " ".join(rng.choice(words, size=12)) + f" #{i}"
+        for i in range(n_articles)
+    ]
+
+
+class StubModel:
+    """
+    Offline stand-in for a SentenceTransformer: deterministic unit vectors
+    derived from each text's hash, with a fixed per-text cost instead of
+    a transformer forward pass.
+    """
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.dim = dim
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(
+        self, texts, show_progress_bar=False, normalize_embeddings=True, **kwargs
+    ):
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.md5(text.encode()).digest()[:8], "little")
+            out[i] = np.random.default_rng(seed).normal(size=self.dim)
+        if normalize_embeddings:
+            out /= np.linalg.norm(out, axis=1, keepdims=True)
+        return out
@@ -0,0 +1,6 @@
+import sys
+
+from music_of_the_day.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main(["backfill", *sys.argv[1:]]))
@@ -0,0 +1,33 @@
+import argparse
+import sys
+
+from music_of_the_day.semantics.storage.state import (
+    DB_PATH,
+    StateStore,
+    migrate_legacy_state,
+)
+
+
+def main():
+    sys.stdout.reconfigure(encoding="utf-8")
+    sys.stderr.reconfigure(encoding="utf-8")
+
+    parser = argparse.ArgumentParser(
+        description=(
+            "Import the per-day embedding, velocity, emotion and topic files "
+            "into the state store."
+        )
+    )
+    parser.add_argument(
+        "--db", default=str(DB_PATH), help="SQLite state store to write"
+    )
+    args = parser.parse_args()
+
+    with StateStore(args.db) as store:
+        days = migrate_legacy_state(store)
+
+    print(f"- Migrated {days} day(s) into {args.db}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import sys
+
+from music_of_the_day.cli import main
+
+sys.exit(main())
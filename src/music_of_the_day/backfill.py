@@ -0,0 +1,276 @@
+import json
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+from music_of_the_day.ingestion.dedup import deduplicate
+from music_of_the_day.ingestion.normalize import normalize_text
+from music_of_the_day.music.render_cache import RenderCache
+from music_of_the_day.pipeline import DEFAULT_SOUNDFONT, render_outputs, run_pipeline
+from music_of_the_day.semantics.embed import EmbeddingEngine
+from music_of_the_day.semantics.emotion import EmotionState
+from music_of_the_day.semantics.storage.article_index import ArticleIndex
+from music_of_the_day.semantics.storage.articles import (
+    ArticleArchiveWriter,
+    load_articles,
+)
+from music_of_the_day.semantics.storage.state import DayState, StateStore
+from music_of_the_day.semantics.topics import TopicEngine
+
+ArticleSource = Callable[[date], list[str]]
+
+
+class ArchiveArticleSource:
+    """
+    Reads archived articles for a day from archive_dir.
+    Accepts YYYY-MM-DD.json (a list of strings) or YYYY-MM-DD.txt
+    (one article per line). Missing days yield no articles.
+    """
+
+    def __init__(self, archive_dir: str | Path):
+        self.archive_dir = Path(archive_dir)
+
+    def __call__(self, day: date) -> list[str]:
+        json_path = self.archive_dir / f"{day.isoformat()}.json"
+        if json_path.exists():
+            return list(json.loads(json_path.read_text(encoding="utf-8")))
+
+        txt_path = self.archive_dir / f"{day.isoformat()}.txt"
+        if txt_path.exists():
+            lines = txt_path.read_text(encoding="utf-8").splitlines()
+            return [line for line in lines if line.strip()]
+
+        return []
+
+
+@dataclass
+class BackfillState:
+    """
+    Day-to-day continuity carried in memory between backfilled days.
+    """
+    rolling_days: int = 14
+    history: deque = field(default_factory=deque)  # (date, daily embedding)
+    embedding_yesterday: Optional[np.ndarray] = None
+    velocity_yesterday: Optional[float] = None
+    emotion_yesterday: Optional[EmotionState] = None
+    topic_engine: TopicEngine = field(default_factory=TopicEngine)
+    article_index: ArticleIndex = field(default_factory=ArticleIndex)
+
+    @classmethod
+    def from_storage(
+        cls,
+        start: date,
+        rolling_days: int = 14,
+        store: Optional[StateStore] = None
+    ) -> "BackfillState":
+        """
+        Seed the state from whatever is already stored before start,
+        with one range query over the state store.
+        """
+        if store is None:
+            with StateStore() as store:
+                return cls.from_storage(start, rolling_days, store)
+
+        before = start - timedelta(days=1)
+        stored = store.load_range(start - timedelta(days=rolling_days), before)
+        if stored and stored[-1].day == before:
+            previous = stored[-1]
+        else:
+            previous = DayState(day=before)
+
+        state = cls(
+            rolling_days=rolling_days,
+            embedding_yesterday=previous.embedding,
+            velocity_yesterday=previous.velocity,
+            emotion_yesterday=previous.emotion,
+            topic_engine=TopicEngine(previous_centroids=previous.centroids)
+        )
+        for day_state in stored:
+            if day_state.embedding is not None:
+                state.history.append((day_state.day, day_state.embedding))
+        return state
+
+    def rolling_average(self, today: date) -> Optional[np.ndarray]:
+        cutoff = today - timedelta(days=self.rolling_days)
+        while self.history and self.history[0][0] < cutoff:
+            self.history.popleft()
+        if not self.history:
+            return None
+        return np.mean([emb for _, emb in self.history], axis=0, keepdims=True)
+
+    def advance(self, today: date, daily_embedding: np.ndarray, features):
+        self.history.append((today, daily_embedding))
+        self.embedding_yesterday = daily_embedding
+        self.velocity_yesterday = features.semantic_velocity
+        self.emotion_yesterday = features.emotion
+
+
+def iter_days(start: date, end: date):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+
+def render_days(
+    days: list[tuple[date, object, object]],
+    out_root: str | Path = "outputs",
+    soundfont_path: str = DEFAULT_SOUNDFONT,
+    workers: int = 1,
+    cache: Optional[RenderCache] = None,
+    quality: str = "full"
+) -> list[date]:
+    """
+    Render MIDI, WAV and explanation for (day, features, intent) triples.
+    Days are independent, so with workers > 1 they are fanned out over a
+    process pool. Prints progress as each day finishes and returns the
+    days that rendered successfully.
+    """
+    total = len(days)
+    finished = 0
+    rendered = []
+
+    def report(day, error=None):
+        nonlocal finished
+        finished += 1
+        if error is None:
+            rendered.append(day)
+            print(f"- [{finished}/{total}] rendered {day.isoformat()}")
+        else:
+            print(
+                f"⚠️ [{finished}/{total}] rendering failed "
+                f"({day.isoformat()}): {error}"
+            )
+
+    if workers <= 1:
+        for day, features, intent in days:
+            try:
+                render_outputs(
+                    features,
+                    intent,
+                    Path(out_root) / day.isoformat(),
+                    soundfont_path,
+                    quality=quality,
+                    cache=cache
+                )
+            except Exception as e:
+                report(day, e)
+            else:
+                report(day)
+        return rendered
+
+    # Spawned rather than forked: the semantic pass has loaded torch, and
+    # forking a process whose OpenMP threads are running can deadlock
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {
+            pool.submit(
+                render_outputs,
+                features,
+                intent,
+                Path(out_root) / day.isoformat(),
+                soundfont_path,
+                quality=quality,
+                cache=cache
+            ): day
+            for day, features, intent in days
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                report(futures[future], e)
+            else:
+                report(futures[future])
+
+    return sorted(rendered)
+
+
+def run_backfill(
+    start: date,
+    end: date,
+    article_source: ArticleSource,
+    out_root: str | Path = "outputs",
+    soundfont_path: str = DEFAULT_SOUNDFONT,
+    render: bool = True,
+    persist: bool = True,
+    rolling_days: int = 14,
+    embedder: Optional[EmbeddingEngine] = None,
+    workers: int = 1,
+    cache: Optional[RenderCache] = None,
+    store: Optional[StateStore] = None,
+    quality: str = "full"
+) -> list[date]:
+    """
+    Regenerate every day in [start, end].
+
+    The semantic pass runs first, in order and in one process: yesterday's
+    embedding, velocity and emotion are threaded through memory rather
+    than re-read from the state store, and the model is loaded once, by
+    the first day that is not in the embedding archive.
+    Rendering then runs afterwards, across `workers` processes.
+    Days whose articles are no longer available are recomputed from the
+    per-article embedding archive when it has them; days without either
+    are skipped and leave the state untouched.
+    Returns the days whose semantics were generated.
+    """
+    # A store passed in stays open for the caller
+    store_context = StateStore() if store is None else nullcontext(store)
+    with store_context as store:
+        state = BackfillState.from_storage(start, rolling_days, store)
+        generated = []
+
+        # --- Sequential semantic pass ---
+        for day in iter_days(start, end):
+            articles = deduplicate([normalize_text(a) for a in article_source(day)])
+            archived = None if articles else load_articles(day)
+            if not articles and archived is None:
+                print(f"- {day.isoformat()}: no articles, skipped")
+                continue
+            archive = ArticleArchiveWriter(day) if persist and articles else None
+            if archived is None and embedder is None:
+                # Only loaded once a day actually needs embedding
+                embedder = EmbeddingEngine()
+
+            features, intent, daily_embedding = run_pipeline(
+                articles=articles,
+                rolling_embeddings=state.rolling_average(day),
+                embedding_yesterday=state.embedding_yesterday,
+                velocity_yesterday=state.velocity_yesterday,
+                emotion_yesterday=state.emotion_yesterday,
+                embedder=embedder,
+                topic_engine=state.topic_engine,
+                article_index=state.article_index,
+                day=day,
+                archive=archive,
+                embeddings=archived.embeddings if archived is not None else None
+            )
+            state.advance(day, daily_embedding, features)
+
+            if persist:
+                store.save_day(DayState(
+                    day=day,
+                    embedding=daily_embedding,
+                    velocity=features.semantic_velocity,
+                    emotion=features.emotion,
+                    centroids=state.topic_engine.previous_centroids
+                ))
+                if archive is not None:
+                    archive.save()
+                state.article_index.save()  # appends just this day
+
+            generated.append((day, features, intent))
+            print(f"- {day.isoformat()}: {features.narrative_phase}")
+
+    # --- Independent rendering pass ---
+    if render:
+        render_days(generated, out_root, soundfont_path, workers, cache, quality)
+
+    return [day for day, _, _ in generated]
@@ -0,0 +1,197 @@
+import argparse
+import os
+import sys
+from datetime import date
+from pathlib import Path
+
+DEFAULT_OUTPUTS = "outputs"
+
+# Each command imports what it needs inside its handler, so --help,
+# explain and inspect never load the embedding model, sklearn or the
+# audio stack.
+
+
+def _run(args) -> int:
+    from music_of_the_day.daily import run_daily
+
+    paths = run_daily(out_root=args.outputs, limit=args.limit)
+    return 0 if paths is not None else 1
+
+
+def _backfill(args) -> int:
+    from music_of_the_day.backfill import ArchiveArticleSource, run_backfill
+    from music_of_the_day.instrumentation import start_run
+    from music_of_the_day.music.render_cache import RenderCache
+    from music_of_the_day.pipeline import DEFAULT_SOUNDFONT
+
+    # Rendering in worker processes (--workers > 1) is not captured here
+    report = start_run("backfill")
+    days = run_backfill(
+        start=args.start,
+        end=args.end,
+        article_source=ArchiveArticleSource(args.archive),
+        out_root=args.outputs,
+        soundfont_path=args.soundfont or DEFAULT_SOUNDFONT,
+        render=not args.no_render,
+        workers=args.workers,
+        cache=RenderCache()
+    )
+    report_name = f"backfill_report_{args.start}_{args.end}.json"
+    report.write_json(Path(args.outputs) / report_name)
+    print(f"- Backfilled {len(days)} day(s) from {args.start} to {args.end}")
+    return 0
+
+
+def _explain(args) -> int:
+    from music_of_the_day.explain.explanation import generate_explanation
+    from music_of_the_day.explain.snapshot import read_features_json
+
+    out_dir = Path(args.outputs) / args.day.isoformat()
+    features_path = out_dir / "features.json"
+    if not features_path.exists():
+        print(
+            f"⚠️ No features.json for {args.day.isoformat()} in {out_dir}",
+            file=sys.stderr
+        )
+        return 1
+
+    explanation = generate_explanation(*read_features_json(features_path))
+    if args.write:
+        (out_dir / "explanation.txt").write_text(explanation)
+    print(explanation)
+    return 0
+
+
+def _inspect(args) -> int:
+    from music_of_the_day.semantics.storage import article_index, articles, state
+
+    db_path = Path(args.db or state.DB_PATH)
+    if db_path.exists():
+        with state.StateStore(db_path) as store:
+            count, first, last = store.day_span()
+            latest = store.load_latest()
+            anchor = store.rolling_anchor()
+        print(f"State store ({db_path}): {count} day(s)")
+        if count:
+            print(f"  range:    {first.isoformat()} .. {last.isoformat()}")
+            if anchor is not None:
+                windows = "/".join(str(n) for n in state.ROLLING_WINDOWS)
+                print(f"  rolling:  {windows}-day windows through {anchor.isoformat()}")
+            if latest.velocity is not None:
+                print(f"  velocity: {latest.velocity:.4f}")
+            if latest.emotion is not None:
+                e = latest.emotion
+                print(
+                    f"  emotion:  valence {e.valence:.2f}, "
+                    f"arousal {e.arousal:.2f}, tension {e.tension:.2f}"
+                )
+    else:
+        print(f"State store ({db_path}): not created yet")
+
+    archived = articles.archived_days()
+    print(f"Article archive: {len(archived)} day(s)", end="")
+    print(f", latest {archived[-1].isoformat()}" if archived else "")
+
+    print(f"Article index: {len(article_index.ArticleIndex())} article(s)")
+    return 0
+
+
+def _serve(args) -> int:
+    from music_of_the_day.service import GenerationService, serve
+
+    service = GenerationService(
+        out_root=args.outputs,
+        soundfont_path=args.soundfont,
+        quality=args.quality
+    )
+    serve(service, host=args.host, port=args.port, workers=args.workers)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="music_of_the_day",
+        description="Daily news → semantic meaning → music."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Generate today's piece")
+    run.add_argument("--outputs", default=DEFAULT_OUTPUTS)
+    run.add_argument("--limit", type=int, default=7, help="Articles per source")
+    run.set_defaults(handler=_run)
+
+    backfill = commands.add_parser("backfill", help="Regenerate a range of past dates")
+    for flag in ("--start", "--end"):
+        backfill.add_argument(
+            flag, required=True, type=date.fromisoformat, help="YYYY-MM-DD"
+        )
+    backfill.add_argument(
+        "--archive",
+        required=True,
+        help="Directory of YYYY-MM-DD.json / .txt article files"
+    )
+    backfill.add_argument("--outputs", default=DEFAULT_OUTPUTS)
+    backfill.add_argument("--soundfont", help="SoundFont (.sf2) for full-quality WAVs")
+    backfill.add_argument(
+        "--no-render",
+        action="store_true",
+        help="Only rebuild the stored semantic state"
+    )
+    backfill.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes used for MIDI/WAV/explanation rendering"
+    )
+    backfill.set_defaults(handler=_backfill)
+
+    explain = commands.add_parser(
+        "explain",
+        help="Re-generate a day's explanation from its saved features.json"
+    )
+    explain.add_argument("day", type=date.fromisoformat, help="YYYY-MM-DD")
+    explain.add_argument("--outputs", default=DEFAULT_OUTPUTS)
+    explain.add_argument(
+        "--write", action="store_true", help="Also rewrite explanation.txt"
+    )
+    explain.set_defaults(handler=_explain)
+
+    inspect = commands.add_parser("inspect", help="Summarize the stored state")
+    inspect.add_argument(
+        "--db", help="SQLite state store (default: data/processed/state.db)"
+    )
+    inspect.set_defaults(handler=_inspect)
+
+    serve = commands.add_parser(
+        "serve",
+        help="Keep the model and SoundFont loaded and generate over HTTP"
+    )
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help=(
+            "Pre-forked worker processes (a single threaded process on Windows); "
+            "each caps torch at cpu_count / workers threads"
+        )
+    )
+    serve.add_argument("--outputs", default=DEFAULT_OUTPUTS)
+    serve.add_argument("--soundfont", help="SoundFont (.sf2) for full-quality WAVs")
+    serve.add_argument("--quality", choices=("full", "preview"), default="full")
+    serve.set_defaults(handler=_serve)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    sys.stdout.reconfigure(encoding="utf-8")
+    sys.stderr.reconfigure(encoding="utf-8")
+
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
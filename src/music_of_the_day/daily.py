@@ -0,0 +1,87 @@
+from datetime import date
+from pathlib import Path
+
+from music_of_the_day.ingestion.dedup import NearDuplicateFilter
+from music_of_the_day.ingestion.fetch_news import iter_news, load_config
+from music_of_the_day.ingestion.normalize import normalize_text
+from music_of_the_day.instrumentation import instrumented_iter, start_run
+from music_of_the_day.music.render_cache import RenderCache
+from music_of_the_day.pipeline import render_outputs, run_streaming_pipeline
+from music_of_the_day.semantics.storage.article_index import ArticleIndex
+from music_of_the_day.semantics.storage.articles import ArticleArchiveWriter
+from music_of_the_day.semantics.storage.state import DayState, StateStore
+from music_of_the_day.semantics.topics import TopicEngine
+
+
+def run_daily(
+    out_root: str | Path = "outputs", limit: int = 7
+) -> dict[str, Path] | None:
+    """
+    Fetch today's news, update the stored state and render today's
+    outputs under out_root. Returns the output paths, or None when no
+    articles could be fetched.
+    """
+    day = date.today()
+    today = day.isoformat()
+    report = start_run("daily")
+
+    # --- Step 1: Fetch news (lazily, feeds keep downloading while we embed) ---
+    articles = instrumented_iter("fetch", iter_news(limit=limit))
+
+    # --- Step 2: Normalize text and drop repeated wire stories ---
+    normalized_articles = NearDuplicateFilter().filter(
+        normalize_text(a) for a in articles
+    )
+
+    # --- Step 3: Load the most recent earlier day's state for continuity ---
+    with StateStore() as store:
+        previous = store.load_latest(before=day) or DayState(day=day)
+        rolling_embeddings = store.rolling_average(day, n=14)  # last 14 days
+        topic_engine = TopicEngine(previous_centroids=previous.centroids)
+        article_index = ArticleIndex()
+        archive = ArticleArchiveWriter()
+
+        # --- Step 4: Run pipeline (embeds article batches as they stream in) ---
+        result = run_streaming_pipeline(
+            articles=normalized_articles,
+            rolling_embeddings=rolling_embeddings,
+            embedding_yesterday=previous.embedding,
+            velocity_yesterday=previous.velocity,
+            emotion_yesterday=previous.emotion,
+            topic_engine=topic_engine,
+            article_index=article_index,
+            archive=archive
+        )
+        if result is None:
+            print("No articles fetched. Exiting.")
+            return None
+        features, intent, daily_embedding = result
+
+        # --- Step 5: Save today's state for next day's continuity (one transaction) ---
+        store.save_day(DayState(
+            day=day,
+            embedding=daily_embedding,
+            velocity=features.semantic_velocity,
+            emotion=features.emotion,
+            centroids=topic_engine.previous_centroids
+        ))
+    article_index.save()
+    archive.save()  # per-article embeddings, so features can be recomputed offline
+
+    # --- Step 6: Generate MIDI, WAV and explanation ---
+    paths = render_outputs(
+        features, intent, Path(out_root) / today, cache=RenderCache()
+    )
+
+    # --- Step 7: Per-stage timing and memory report ---
+    report.write_json(Path(out_root) / today / "run_report.json")
+    textfile = load_config().get("instrumentation", {}).get("prometheus_textfile")
+    if textfile:
+        report.write_prometheus(textfile)
+
+    print(f"- Music of the Day generated for {today}:")
+    print(f"- MIDI: {paths['midi']}")
+    print(f"- WAV: {paths['wav']}")
+    print(f"- Explanation: {paths['explanation']}")
+
+    return paths
@@ -1,8 +1,10 @@
+from music_of_the_day.instrumentation import instrumented
 from music_of_the_day.semantics.features import SemanticFeatures
 from music_of_the_day.mapping.music_intent import MusicIntent
 import numpy as np
 
 
+@instrumented("explanation")
 def generate_explanation(
     features: SemanticFeatures,
     music: MusicIntent
@@ -68,6 +70,20 @@ def generate_explanation(
             f"A more transparent texture (avg. density {mean_density:.2f}) reflects narrative focus and clarity."
         )
 
+    # --- Topic continuity ---
+    if features.topic_continuity is not None:
+        if features.topic_continuity > 0.6:
+            lines.append(
+                f"Most of today's stories ({features.topic_continuity:.0%}) "
+                "continue yesterday's topics, so the musical material carries "
+                "over rather than starting afresh."
+            )
+        elif features.topic_continuity < 0.2:
+            lines.append(
+                "Today's topics break almost entirely with yesterday's, "
+                "marking a fresh start."
+            )
+
     # --- Harmonic / emotional tension ---
     mean_tension = float(np.mean(music.tension_curve))
     if features.intra_day_dispersion > 0.5:
@@ -0,0 +1,47 @@
+import json
+from dataclasses import asdict, fields
+from pathlib import Path
+
+import numpy as np
+
+from music_of_the_day.mapping.music_intent import MusicIntent
+from music_of_the_day.semantics.emotion import EmotionState
+from music_of_the_day.semantics.features import SemanticFeatures
+
+
+def _plain(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def write_features_json(
+    features: SemanticFeatures, intent: MusicIntent, path: str | Path
+) -> Path:
+    """
+    Save a day's features and intent, so the explanation can be
+    regenerated later without the model or any audio work.
+    """
+    payload = {
+        "features": {k: _plain(v) for k, v in asdict(features).items()},
+        "intent": {f.name: _plain(getattr(intent, f.name)) for f in fields(intent)},
+    }
+    path = Path(path)
+    path.write_text(json.dumps(payload, indent=2))
+    return path
+
+
+def read_features_json(path: str | Path) -> tuple[SemanticFeatures, MusicIntent]:
+    data = json.loads(Path(path).read_text())
+
+    features = dict(data["features"])
+    features["emotion"] = EmotionState(**features["emotion"])
+
+    intent = dict(data["intent"])
+    curves = ("intensity_curve", "tension_curve", "density_curve", "emotional_vector")
+    for name in curves:
+        intent[name] = np.asarray(intent[name])
+
+    return SemanticFeatures(**features), MusicIntent(**intent)
@@ -0,0 +1,83 @@
+import hashlib
+import re
+from collections import defaultdict
+
+import numpy as np
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _shingles(text: str, size: int) -> list[str]:
+    tokens = _TOKEN_RE.findall(text.lower())
+    if len(tokens) <= size:
+        return [" ".join(tokens)]
+    return [" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)]
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    64-bit SimHash of the text's word shingles.
+    Texts that share most shingles end up a few bits apart.
+    """
+    digests = b"".join(
+        hashlib.blake2b(s.encode(), digest_size=8).digest()
+        for s in _shingles(text, shingle_size)
+    )
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8)).reshape(-1, 64)
+    votes = bits.sum(axis=0, dtype=np.int64) * 2 - len(bits)
+    return int.from_bytes(np.packbits(votes > 0).tobytes(), "big")
+
+
+class NearDuplicateFilter:
+    """
+    Streaming near-duplicate detector over SimHash fingerprints.
+
+    Fingerprints are split into max_distance + 1 bands; by the pigeonhole
+    principle two fingerprints within max_distance bits agree exactly on
+    at least one band, so only texts sharing a band are compared.
+    """
+
+    def __init__(self, max_distance: int = 6, shingle_size: int = 3):
+        self.max_distance = max_distance
+        self.shingle_size = shingle_size
+
+        num_bands = max_distance + 1
+        edges = np.linspace(0, 64, num_bands + 1).astype(int)
+        self._bands = [
+            (int(lo), (1 << int(hi - lo)) - 1) for lo, hi in zip(edges[:-1], edges[1:])
+        ]
+        self._buckets = defaultdict(list)
+
+    def is_duplicate(self, text: str) -> bool:
+        """
+        True if text is within max_distance bits of a text seen before.
+        Otherwise it is remembered and False is returned.
+        """
+        fp = simhash(text, self.shingle_size)
+        keys = [
+            (b, (fp >> shift) & mask) for b, (shift, mask) in enumerate(self._bands)
+        ]
+
+        for key in keys:
+            for other in self._buckets.get(key, ()):
+                if (fp ^ other).bit_count() <= self.max_distance:
+                    return True
+
+        for key in keys:
+            self._buckets[key].append(fp)
+        return False
+
+    def filter(self, texts):
+        """
+        Lazily yield the texts that are not near-duplicates of earlier ones.
+        """
+        for text in texts:
+            if not self.is_duplicate(text):
+                yield text
+
+
+def deduplicate(texts: list[str], max_distance: int = 6) -> list[str]:
+    """
+    Drop near-duplicate articles, keeping the first occurrence of each story.
+    """
+    return list(NearDuplicateFilter(max_distance=max_distance).filter(texts))
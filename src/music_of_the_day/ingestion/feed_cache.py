@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Optional
+
+
+class FeedCache:
+    """
+    On-disk cache of parsed RSS feeds keyed by URL.
+    Stores the validators (ETag / Last-Modified) the server sent with
+    the last full response, together with the parsed entries.
+    """
+
+    def __init__(self, cache_dir: str = "data/cache/feeds"):
+        self.cache_dir = Path(cache_dir)
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{hashlib.md5(url.encode()).hexdigest()}.json"
+
+    def load(self, url: str) -> Optional[dict]:
+        path = self._path(url)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))
+
+    def store(
+        self,
+        url: str,
+        entries: list[dict],
+        etag: Optional[str] = None,
+        modified: Optional[str] = None
+    ):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(url)
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(
+            json.dumps({
+                "url": url,
+                "etag": etag,
+                "modified": modified,
+                "entries": entries,
+            }),
+            encoding="utf-8"
+        )
+        os.replace(tmp_path, path)
+
+
+def _entry_fields(entry) -> dict:
+    return {
+        "title": entry.title,
+        "summary": getattr(entry, "summary", None),
+    }
+
+
+def parse_feed(
+    url: str,
+    cache: Optional[FeedCache] = None,
+    timeout: float = 10
+) -> list[dict]:
+    """
+    Parse a feed into [{"title", "summary"}] entries.
+    The document is downloaded with a socket timeout, so a hung server
+    fails the fetch instead of holding its thread forever. With a cache,
+    the request is conditional: a 304 reuses the cached entries without
+    downloading or parsing the document again.
+    """
+    import feedparser
+    import requests
+
+    cached = cache.load(url) if cache is not None else None
+    headers = {}
+    if cached is not None:
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("modified"):
+            headers["If-Modified-Since"] = cached["modified"]
+
+    try:
+        resp = requests.get(url, headers=headers, timeout=timeout)
+        if cached is not None and resp.status_code == 304:
+            return cached["entries"]
+        resp.raise_for_status()
+    except requests.RequestException:
+        if cached is None:
+            raise
+        # Network failure: serve the last good copy rather than nothing
+        print(f"⚠️ Feed unreachable, using cached copy ({url})")
+        return cached["entries"]
+
+    entries = [_entry_fields(e) for e in feedparser.parse(resp.content).entries]
+    if cache is not None:
+        cache.store(
+            url,
+            entries,
+            etag=resp.headers.get("ETag"),
+            modified=resp.headers.get("Last-Modified")
+        )
+    return entries
@@ -1,9 +1,13 @@
 import os
-import requests
-import feedparser
+import threading
+import time
 import yaml
+from concurrent.futures import Future, TimeoutError as FutureTimeout
 from pathlib import Path
 
+from music_of_the_day.ingestion.feed_cache import FeedCache, parse_feed
+from music_of_the_day.instrumentation import instrumented
+
 CONFIG_PATH = Path("configs/sources.yaml")
 
 def load_config():
@@ -15,50 +19,202 @@ def load_config():
         return yaml.safe_load(f)
 
 
-def fetch_news(api_key: str = None, query: str = "world", limit: int = 7):
+@instrumented("fetch.newsapi", items=len)
+def _fetch_newsapi(api_key: str, query: str, limit: int, timeout: float) -> list[str]:
+    import requests
+
+    url = "https://newsapi.org/v2/top-headlines"
+    params = {"apiKey": api_key, "q": query, "pageSize": limit, "language": "en"}
+    resp = requests.get(url, params=params, timeout=timeout)
+    resp.raise_for_status()
+    data = resp.json()
+
+    articles = []
+    for item in data.get("articles", []):
+        text = item["title"]
+        if item.get("description"):
+            text += ". " + item["description"]
+        articles.append(text)
+    return articles
+
+
+@instrumented("fetch.rss", items=len)
+def _fetch_rss(
+    feed_url: str,
+    limit: int,
+    cache: FeedCache | None = None,
+    timeout: float = 10
+) -> list[str]:
+    articles = []
+    for entry in parse_feed(feed_url, cache, timeout)[:limit]:
+        text = entry["title"]
+        if entry.get("summary"):
+            text += ". " + entry["summary"]
+        articles.append(text)
+    return articles
+
+
+def _submit(fn, args, slots: threading.BoundedSemaphore) -> Future:
     """
-    Fetches recent news articles.
-    - Uses NewsAPI if api_key is provided
-    - Falls back to RSS feeds from configs if NewsAPI fails or api_key is missing
-    Returns a list of article texts (title + description/summary)
+    Run fn(*args) on a daemon thread once a slot is free. Daemon threads
+    let an abandoned, hung feed die with the process instead of blocking
+    interpreter exit the way ThreadPoolExecutor workers would.
+    """
+    future = Future()
+    future.started_at = None
+
+    def worker():
+        with slots:
+            if not future.set_running_or_notify_cancel():
+                return
+            future.started_at = time.monotonic()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+
+    threading.Thread(target=worker, daemon=True).start()
+    return future
+
+
+def _result_within(future: Future, feed_timeout: float, deadline_at: float):
+    """
+    Wait for a job until feed_timeout after it started or until the batch
+    deadline, whichever comes first. A job still waiting for a slot has
+    not started its own clock yet.
+    """
+    while True:
+        started_at = future.started_at
+        now = time.monotonic()
+        if started_at is None:
+            limit = min(deadline_at, now + feed_timeout)
+        else:
+            limit = min(deadline_at, started_at + feed_timeout)
+        try:
+            return future.result(timeout=max(0.0, limit - now))
+        except FutureTimeout:
+            if started_at is not None or time.monotonic() >= deadline_at:
+                raise
+
+
+def _iter_concurrently(jobs, max_workers: int, feed_timeout: float, deadline: float):
+    """
+    Run (label, fn, args) jobs with at most max_workers in flight.
+    Each job may take at most feed_timeout seconds from when it starts and
+    the whole batch at most deadline seconds; slow jobs are abandoned, not
+    awaited.
+    Results are yielded in job order, so the configured priority holds,
+    and each one as soon as it and everything before it are done.
+    """
+    slots = threading.BoundedSemaphore(max_workers)
+    deadline_at = time.monotonic() + deadline
+    futures = [(label, _submit(fn, args, slots)) for label, fn, args in jobs]
+
+    for label, future in futures:
+        try:
+            yield _result_within(future, feed_timeout, deadline_at)
+        except FutureTimeout:
+            future.cancel()  # no-op if it already started
+            print(f"⚠️ Fetch timed out ({label})")
+        except Exception as e:
+            print(f"⚠️ Fetch failed ({label}): {e}")
+
+
+def iter_news(
+    api_key: str = None,
+    query: str = "world",
+    limit: int = 7,
+    concurrent: bool | None = None
+):
+    """
+    Lazily yields up to limit article texts, in priority order.
+    Articles from a source are available as soon as that source (and
+    every higher-priority one) has been fetched, so downstream stages can
+    start while slower feeds are still downloading.
     """
     config = load_config()
-    articles = []
+    ingestion = config.get("ingestion", {})
 
     # --- Step 1: Use NewsAPI if key provided ---
     api_key = api_key or os.environ.get("NEWS_API_KEY") or config["news_api"].get("api_key")
     query = query or config["news_api"].get("query", "world")
     limit = limit or config["news_api"].get("limit", 7)
+    rss_feeds = config.get("rss_feeds", [])
+
+    if concurrent is None:
+        concurrent = ingestion.get("concurrent", True)
+    feed_timeout = ingestion.get("feed_timeout", 10)
+
+    # Conditional GETs are only made when a cache directory is configured
+    cache = None
+    if config.get("feed_cache", {}).get("dir"):
+        cache = FeedCache(config["feed_cache"]["dir"])
+
+    count = 0
+
+    if concurrent:
+        jobs = []
+        if api_key:
+            jobs.append(
+                ("NewsAPI", _fetch_newsapi, (api_key, query, limit, feed_timeout))
+            )
+        jobs += [
+            (url, _fetch_rss, (url, limit, cache, feed_timeout)) for url in rss_feeds
+        ]
+
+        results = _iter_concurrently(
+            jobs,
+            max_workers=ingestion.get("max_workers", 8),
+            feed_timeout=feed_timeout,
+            deadline=ingestion.get("deadline", 30)
+        )
+        for result in results:
+            for text in result:
+                yield text
+                count += 1
+                if count >= limit:
+                    return
+        return
 
     if api_key:
-        url = "https://newsapi.org/v2/top-headlines"
-        params = {"apiKey": api_key, "q": query, "pageSize": limit, "language": "en"}
         try:
-            resp = requests.get(url, params=params, timeout=10)
-            resp.raise_for_status()
-            data = resp.json()
-            for item in data.get("articles", []):
-                text = item["title"]
-                if item.get("description"):
-                    text += ". " + item["description"]
-                articles.append(text)
+            for text in _fetch_newsapi(api_key, query, limit, feed_timeout):
+                yield text
+                count += 1
+                if count >= limit:
+                    return
         except Exception as e:
             print(f"⚠️ NewsAPI fetch failed: {e}")
 
     # --- Step 2: Fallback to RSS feeds if necessary ---
-    if len(articles) < limit:
-        rss_feeds = config.get("rss_feeds", [])
-        for feed_url in rss_feeds:
-            try:
-                feed = feedparser.parse(feed_url)
-                for entry in feed.entries[:limit]:
-                    text = entry.title
-                    if getattr(entry, "summary", None):
-                        text += ". " + entry.summary
-                    articles.append(text)
-                if len(articles) >= limit:
-                    break
-            except Exception as e:
-                print(f"⚠️ RSS feed fetch failed ({feed_url}): {e}")
+    for feed_url in rss_feeds:
+        try:
+            result = _fetch_rss(feed_url, limit, cache, feed_timeout)
+        except Exception as e:
+            print(f"⚠️ RSS feed fetch failed ({feed_url}): {e}")
+            continue
+        for text in result:
+            yield text
+            count += 1
+            if count >= limit:
+                return
+
 
-    return articles[:limit]
+@instrumented("fetch", items=len)
+def fetch_news(
+    api_key: str = None,
+    query: str = "world",
+    limit: int = 7,
+    concurrent: bool | None = None
+):
+    """
+    Fetches recent news articles.
+    - Uses NewsAPI if api_key is provided
+    - Falls back to RSS feeds from configs if NewsAPI fails or api_key is missing
+    - In concurrent mode all sources are fetched at once and merged in
+      priority order (NewsAPI first, then feeds as configured)
+    Returns a list of article texts (title + description/summary)
+    """
+    return list(
+        iter_news(api_key=api_key, query=query, limit=limit, concurrent=concurrent)
+    )
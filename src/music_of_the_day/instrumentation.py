@@ -0,0 +1,250 @@
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Peak resident set size of this process so far (its high-water mark,
+    never lower than at any earlier call), or None where the platform
+    does not report it.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+@dataclass
+class StageStats:
+    """
+    Totals for every span recorded under one stage name.
+    CPU time is process-wide, so stages that overlap in threads each
+    see the others' work. peak_rss_growth_bytes is the most any one
+    call raised the process's peak RSS: a stage that only reuses memory
+    freed by an earlier one reports 0.
+    """
+    calls: int = 0
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    items: int = 0
+    peak_rss_growth_bytes: Optional[int] = None
+
+
+@dataclass
+class RunReport:
+    """
+    Per-stage timing and memory for one run, in first-seen stage order.
+    """
+    name: str = "run"
+    started_at: float = field(default_factory=time.time)
+    stages: dict[str, StageStats] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._wall0 = time.perf_counter()
+        self._cpu0 = time.process_time()
+
+    def record(
+        self,
+        stage: str,
+        wall: float,
+        cpu: float,
+        items: Optional[int] = None,
+        rss_before: Optional[int] = None
+    ):
+        rss_after = peak_rss_bytes()
+        growth = None
+        if rss_before is not None and rss_after is not None:
+            growth = rss_after - rss_before
+        with self._lock:
+            stats = self.stages.setdefault(stage, StageStats())
+            stats.calls += 1
+            stats.wall_seconds += wall
+            stats.cpu_seconds += cpu
+            stats.items += items or 0
+            if growth is not None:
+                stats.peak_rss_growth_bytes = max(
+                    growth, stats.peak_rss_growth_bytes or 0
+                )
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            stages = {name: asdict(stats) for name, stats in self.stages.items()}
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "wall_seconds": time.perf_counter() - self._wall0,
+            "cpu_seconds": time.process_time() - self._cpu0,
+            "peak_rss_bytes": peak_rss_bytes(),
+            "stages": stages,
+        }
+
+    def write_json(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+        return path
+
+    def write_prometheus(
+        self, path: str | Path, prefix: str = "music_of_the_day"
+    ) -> Path:
+        """
+        Write the report in the node_exporter textfile format. The file is
+        replaced atomically so the collector never reads half of it.
+        """
+        report = self.to_dict()
+        lines = []
+        for metric, key, help_text in (
+            (
+                "stage_wall_seconds",
+                "wall_seconds",
+                "Wall-clock time spent in the stage",
+            ),
+            ("stage_cpu_seconds", "cpu_seconds", "Process CPU time spent in the stage"),
+            ("stage_items", "items", "Items processed by the stage"),
+            ("stage_calls", "calls", "Times the stage ran"),
+            (
+                "stage_peak_rss_growth_bytes",
+                "peak_rss_growth_bytes",
+                "Largest rise in the process peak RSS during one call of the stage",
+            ),
+        ):
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} gauge")
+            for stage, stats in report["stages"].items():
+                if stats[key] is None:
+                    continue
+                labels = f'run="{self.name}",stage="{stage}"'
+                lines.append(f"{prefix}_{metric}{{{labels}}} {stats[key]}")
+
+        for metric, key in (
+            ("run_wall_seconds", "wall_seconds"),
+            ("peak_rss_bytes", "peak_rss_bytes"),
+        ):
+            if report[key] is not None:
+                lines.append(f"# TYPE {prefix}_{metric} gauge")
+                lines.append(f'{prefix}_{metric}{{run="{self.name}"}} {report[key]}')
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n")
+        os.replace(tmp_path, path)
+        return path
+
+
+# The report spans are recorded into; None disables instrumentation
+_ACTIVE: Optional[RunReport] = None
+
+
+def start_run(name: str = "run") -> RunReport:
+    """
+    Begin a new report and make it the one spans record into.
+    """
+    global _ACTIVE
+    _ACTIVE = RunReport(name=name)
+    return _ACTIVE
+
+
+def stop_run() -> Optional[RunReport]:
+    global _ACTIVE
+    report, _ACTIVE = _ACTIVE, None
+    return report
+
+
+def active_report() -> Optional[RunReport]:
+    return _ACTIVE
+
+
+class _Span:
+    def __init__(self, items: Optional[int] = None):
+        self.items = items
+
+
+@contextmanager
+def span(stage: str, items: Optional[int] = None) -> Iterator[_Span]:
+    """
+    Time a block as one call of stage. The yielded handle's items can be
+    set inside the block once the count is known. A no-op without an
+    active report.
+    """
+    handle = _Span(items)
+    report = _ACTIVE
+    if report is None:
+        yield handle
+        return
+
+    rss0 = peak_rss_bytes()
+    wall0, cpu0 = time.perf_counter(), time.process_time()
+    try:
+        yield handle
+    finally:
+        report.record(
+            stage,
+            time.perf_counter() - wall0,
+            time.process_time() - cpu0,
+            handle.items,
+            rss0
+        )
+
+
+def instrumented_iter(stage: str, iterable: Iterable) -> Iterator:
+    """
+    Yield from iterable, recording the time spent waiting for its items
+    as one call of stage, with the item count. Time the consumer spends
+    between items is not counted, so a lazily consumed stream does not
+    absorb the stages that process it.
+    """
+    report = _ACTIVE
+    if report is None:
+        yield from iterable
+        return
+
+    rss0 = peak_rss_bytes()
+    iterator = iter(iterable)
+    wall = cpu = 0.0
+    count = 0
+    done = object()
+    try:
+        while True:
+            wall0, cpu0 = time.perf_counter(), time.process_time()
+            item = next(iterator, done)
+            wall += time.perf_counter() - wall0
+            cpu += time.process_time() - cpu0
+            if item is done:
+                return
+            count += 1
+            yield item
+    finally:
+        report.record(stage, wall, cpu, count, rss0)
+
+
+def instrumented(stage: str, items: Optional[Callable] = None):
+    """
+    Decorator form of span. items, if given, maps the return value to an
+    item count.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(stage) as s:
+                result = fn(*args, **kwargs)
+                if items is not None:
+                    s.items = items(result)
+                return result
+        return wrapper
+    return decorate
@@ -1,7 +1,9 @@
 import numpy as np
+from music_of_the_day.instrumentation import instrumented
 from music_of_the_day.mapping.music_intent import MusicIntent
 from music_of_the_day.semantics.features import SemanticFeatures
 
+@instrumented("intent")
 def build_intent(
     features: SemanticFeatures,
     duration_seconds: int = 75,
@@ -1,22 +1,82 @@
-import pretty_midi
+import hashlib
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import fields
+
+import numpy as np
+from music_of_the_day.instrumentation import instrumented
 from music_of_the_day.mapping.music_intent import MusicIntent
-from music_of_the_day.music.renderers.piano import PianoRenderer
-from music_of_the_day.music.renderers.strings import StringsRenderer
-from music_of_the_day.music.renderers.bass import BassRenderer
-from music_of_the_day.music.renderers.percussion import PercussionRenderer
-
-def render_ensemble(intent: MusicIntent, output_path: str):
-    pm = pretty_midi.PrettyMIDI()
-
-    renderers = [
-        StringsRenderer(),
-        BassRenderer(),
-        PianoRenderer(),
-        PercussionRenderer()
-    ]
-
-    for r in renderers:
-        r.render(intent)
-        pm.instruments.append(r.instrument)
-
-    pm.write(output_path)
+from music_of_the_day.music.events import NoteTrack, assign_channels
+from music_of_the_day.music.midi_writer import write_midi
+from music_of_the_day.music.renderers.registry import get_renderers
+
+# Importing the built-in renderers registers them, in this order
+from music_of_the_day.music.renderers import strings, bass, piano, percussion  # noqa: F401
+
+
+def _instrument_seed(root: np.random.SeedSequence, name: str) -> np.random.SeedSequence:
+    """
+    Child seed that depends only on the root entropy and the instrument
+    name, not on how many instruments exist or in which order they run.
+    """
+    return np.random.SeedSequence(root.entropy, spawn_key=(zlib.crc32(name.encode()),))
+
+
+def intent_seed(intent: MusicIntent) -> int:
+    """
+    Seed derived from the intent's contents, so rendering the same intent
+    again gives the same score and byte-identical MIDI.
+    """
+    h = hashlib.sha256()
+    for f in fields(intent):
+        value = getattr(intent, f.name)
+        if isinstance(value, np.ndarray):
+            h.update(np.ascontiguousarray(value, dtype=np.float64).tobytes())
+        else:
+            h.update(repr(value).encode())
+        h.update(b"|")
+    return int.from_bytes(h.digest()[:8], "little")
+
+
+def _render_track(cls, seed, intent: MusicIntent) -> NoteTrack:
+    renderer = cls(seed=seed)
+    renderer.render(intent)
+    return renderer.track
+
+
+@instrumented("midi", items=lambda tracks: sum(len(t.notes) for t in tracks))
+def render_ensemble(
+    intent: MusicIntent,
+    output_path: str,
+    seed: int | None = None,
+    instruments: list[str] | None = None,
+    max_workers: int | None = None
+) -> list[NoteTrack]:
+    """
+    Render every registered instrument (or the named subset) concurrently
+    and write the score to output_path.
+
+    Each instrument only reads the shared intent and draws from its own
+    random stream, so the merged result is the same however the tracks
+    are scheduled. Returns the note tracks so later stages can use them
+    without re-parsing the MIDI file.
+    """
+    registry = get_renderers()
+    names = instruments if instruments is not None else list(registry)
+    unknown = [n for n in names if n not in registry]
+    if unknown:
+        raise ValueError(f"Unknown instruments: {unknown}")
+
+    root = np.random.SeedSequence(seed)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(_render_track, registry[n], _instrument_seed(root, n), intent)
+            for n in names
+        ]
+        # Merge in registry order, not completion order
+        tracks = [f.result() for f in futures]
+
+    tracks = assign_channels(tracks)
+    write_midi(tracks, output_path)
+    return tracks
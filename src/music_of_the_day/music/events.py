@@ -0,0 +1,128 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# One row per note; times are in seconds
+NOTE_DTYPE = np.dtype([
+    ("pitch", np.uint8),
+    ("velocity", np.uint8),
+    ("start", np.float64),
+    ("end", np.float64),
+])
+
+DRUM_CHANNEL = 9
+
+
+def make_notes(
+    pitches: np.ndarray,
+    velocities: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray
+) -> np.ndarray:
+    """
+    Pack parallel note arrays into a NOTE_DTYPE structured array.
+    Pitches and velocities are clipped to the MIDI range.
+    """
+    notes = np.empty(len(pitches), dtype=NOTE_DTYPE)
+    notes["pitch"] = np.clip(pitches, 0, 127)
+    notes["velocity"] = np.clip(velocities, 1, 127)
+    notes["start"] = starts
+    notes["end"] = ends
+    return notes
+
+
+@dataclass
+class NoteTrack:
+    """
+    Columnar note events for one instrument.
+    """
+    name: str
+    program: int
+    is_drum: bool = False
+    channel: int = 0
+    notes: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=NOTE_DTYPE))
+
+    def extend(self, notes: np.ndarray):
+        self.notes = np.concatenate([self.notes, notes])
+
+    @property
+    def end_time(self) -> float:
+        return float(self.notes["end"].max()) if len(self.notes) else 0.0
+
+    def to_pretty_midi(self):
+        """
+        Compatibility export as a pretty_midi.Instrument.
+        """
+        import pretty_midi
+
+        instrument = pretty_midi.Instrument(
+            program=self.program, is_drum=self.is_drum, name=self.name
+        )
+        instrument.notes = [
+            pretty_midi.Note(
+                velocity=int(n["velocity"]),
+                pitch=int(n["pitch"]),
+                start=float(n["start"]),
+                end=float(n["end"])
+            )
+            for n in self.notes
+        ]
+        return instrument
+
+
+def assign_channels(tracks: list[NoteTrack]) -> list[NoteTrack]:
+    """
+    Give drum tracks the General MIDI percussion channel and every other
+    track its own melodic channel, in order.
+    """
+    melodic = [c for c in range(16) if c != DRUM_CHANNEL]
+    i = 0
+    for track in tracks:
+        if track.is_drum:
+            track.channel = DRUM_CHANNEL
+        else:
+            track.channel = melodic[i % len(melodic)]
+            i += 1
+    return tracks
+
+
+def to_pretty_midi(tracks: list[NoteTrack]):
+    """
+    Compatibility export of a whole score as pretty_midi.PrettyMIDI.
+    """
+    import pretty_midi
+
+    pm = pretty_midi.PrettyMIDI()
+    pm.instruments.extend(track.to_pretty_midi() for track in tracks)
+    return pm
+
+
+def tracks_from_pretty_midi(pm) -> list[NoteTrack]:
+    """
+    Convert a pretty_midi.PrettyMIDI score into NoteTracks.
+    """
+    tracks = []
+    for instrument in pm.instruments:
+        notes = instrument.notes
+        track = NoteTrack(
+            name=instrument.name,
+            program=instrument.program,
+            is_drum=instrument.is_drum
+        )
+        track.extend(make_notes(
+            np.array([n.pitch for n in notes], dtype=np.int64),
+            np.array([n.velocity for n in notes], dtype=np.int64),
+            np.array([n.start for n in notes], dtype=np.float64),
+            np.array([n.end for n in notes], dtype=np.float64)
+        ))
+        tracks.append(track)
+    return assign_channels(tracks)
+
+
+def load_tracks(midi_path: str) -> list[NoteTrack]:
+    """
+    Read a MIDI file into NoteTracks.
+    """
+    import pretty_midi
+
+    return tracks_from_pretty_midi(pretty_midi.PrettyMIDI(midi_path))
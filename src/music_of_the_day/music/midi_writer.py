@@ -0,0 +1,91 @@
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from music_of_the_day.music.events import NoteTrack
+
+# Ticks per quarter note and tempo; 120 BPM keeps seconds <-> beats trivial
+RESOLUTION = 480
+TEMPO_BPM = 120.0
+
+
+def _vlq(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized MIDI variable-length quantities.
+    Returns a (n, 4) byte matrix and the number of bytes used per row;
+    row i's encoding is matrix[i, 4 - nbytes[i]:].
+    """
+    values = values.astype(np.int64)
+    groups = np.stack([(values >> shift) & 0x7F for shift in (21, 14, 7, 0)], axis=1)
+    nbytes = 1 + (values >= 1 << 7) + (values >= 1 << 14) + (values >= 1 << 21)
+    groups[:, :3] |= 0x80  # continuation bit on every byte but the last
+    return groups.astype(np.uint8), nbytes
+
+
+def _chunk(tag: bytes, payload: bytes) -> bytes:
+    return tag + struct.pack(">I", len(payload)) + payload
+
+
+def _meta(delta: int, kind: int, data: bytes) -> bytes:
+    # Meta payloads here are short, so the length fits in one VLQ byte
+    return bytes([delta, 0xFF, kind, len(data)]) + data
+
+
+def _track_chunk(track: NoteTrack, ticks_per_second: float) -> bytes:
+    header = _meta(0, 0x03, track.name.encode("latin-1", "replace")[:127])
+    header += bytes([0, 0xC0 | track.channel, track.program & 0x7F])
+
+    notes = track.notes
+    n = len(notes)
+    on_ticks = np.round(notes["start"] * ticks_per_second).astype(np.int64)
+    off_ticks = np.round(notes["end"] * ticks_per_second).astype(np.int64)
+    # A note shorter than a tick still lasts one, or its note-off would sort
+    # ahead of its own note-on
+    off_ticks = np.maximum(off_ticks, on_ticks + 1)
+
+    ticks = np.concatenate([on_ticks, off_ticks])
+    is_on = np.concatenate([np.ones(n, dtype=bool), np.zeros(n, dtype=bool)])
+    pitch = np.concatenate([notes["pitch"], notes["pitch"]])
+    velocity = np.concatenate([notes["velocity"], np.zeros(n, dtype=np.uint8)])
+
+    # Time order; at equal ticks note-offs go first so repeated notes retrigger
+    order = np.lexsort((is_on, ticks))
+    ticks, is_on = ticks[order], is_on[order]
+    pitch, velocity = pitch[order], velocity[order]
+
+    deltas = np.diff(ticks, prepend=0)
+    vlq, nbytes = _vlq(deltas)
+
+    # Each event: up to 4 delta bytes + status, pitch, velocity
+    rows = np.empty((len(ticks), 7), dtype=np.uint8)
+    rows[:, :4] = vlq
+    rows[:, 4] = np.where(is_on, 0x90, 0x80) | track.channel
+    rows[:, 5] = pitch
+    rows[:, 6] = np.where(is_on, velocity, 64)
+
+    keep = np.ones_like(rows, dtype=bool)
+    keep[:, :4] = np.arange(4) >= (4 - nbytes)[:, None]
+    events = rows[keep].tobytes()
+
+    return _chunk(b"MTrk", header + events + _meta(0, 0x2F, b""))
+
+
+def write_midi(tracks: list[NoteTrack], path: str | Path) -> Path:
+    """
+    Write tracks as a type-1 Standard MIDI File straight from the note
+    arrays, without building per-note Python objects.
+    """
+    ticks_per_second = RESOLUTION * TEMPO_BPM / 60.0
+    tempo = int(round(60_000_000 / TEMPO_BPM)).to_bytes(3, "big")
+
+    conductor = _chunk(b"MTrk", _meta(0, 0x51, tempo) + _meta(0, 0x2F, b""))
+    header = _chunk(b"MThd", struct.pack(">HHH", 1, len(tracks) + 1, RESOLUTION))
+
+    path = Path(path)
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(conductor)
+        for track in tracks:
+            f.write(_track_chunk(track, ticks_per_second))
+    return path
@@ -1,12 +1,239 @@
-import pretty_midi
+import threading
 from pathlib import Path
-import scipy.io.wavfile as wavfile
+
+import numpy as np
+
+from music_of_the_day.instrumentation import instrumented
+from music_of_the_day.music.events import NoteTrack, load_tracks
+from music_of_the_day.music.render_cache import RenderCache, render_with_cache
+from music_of_the_day.music.synth import render_preview_to_wav
+from music_of_the_day.music.wav import WavWriter
+
+QUALITY_TIERS = ("full", "preview")
+
+# Synths with a SoundFont already loaded, kept by long-lived processes
+# (see preload_soundfont); keyed by (resolved path, sample rate, gain)
+_SYNTHS: dict[tuple[str, int, float], tuple[object, int, threading.Lock]] = {}
+
+
+def _event_schedule(tracks: list[NoteTrack], sample_rate: int):
+    """
+    Every note-on/off of the score as parallel arrays sorted by sample
+    position, with note-offs first when events coincide.
+    """
+    frames, is_on, channels, pitches, velocities = [], [], [], [], []
+    for track in tracks:
+        n = len(track.notes)
+        frames += [track.notes["start"], track.notes["end"]]
+        is_on += [np.ones(n, dtype=bool), np.zeros(n, dtype=bool)]
+        channels.append(np.full(2 * n, track.channel))
+        pitches += [track.notes["pitch"]] * 2
+        velocities += [track.notes["velocity"]] * 2
+
+    if not frames:
+        return tuple(np.empty(0, dtype=np.int64) for _ in range(5))
+
+    frames = np.round(np.concatenate(frames) * sample_rate).astype(np.int64)
+    is_on = np.concatenate(is_on)
+    order = np.lexsort((is_on, frames))
+    return (
+        frames[order],
+        is_on[order],
+        np.concatenate(channels)[order],
+        np.concatenate(pitches)[order],
+        np.concatenate(velocities)[order],
+    )
+
+
+def _fluidsynth_available(soundfont_path: str | None) -> bool:
+    if not soundfont_path or not Path(soundfont_path).exists():
+        print(f"⚠️ SoundFont not found ({soundfont_path}), using preview synth")
+        return False
+    try:
+        import fluidsynth  # noqa: F401
+    except (ImportError, OSError) as e:
+        print(f"⚠️ FluidSynth unavailable ({e}), using preview synth")
+        return False
+    return True
+
+
+def resolve_quality(quality: str, soundfont_path: str | None) -> str:
+    """
+    Return the tier that will actually render: "full" falls back to
+    "preview" when the SoundFont or FluidSynth is missing. Cache keys are
+    built from this, so a fallback render is never stored as full quality.
+    """
+    if quality not in QUALITY_TIERS:
+        raise ValueError(
+            f"Unknown quality '{quality}', expected one of {QUALITY_TIERS}"
+        )
+    if quality == "full" and not _fluidsynth_available(soundfont_path):
+        return "preview"
+    return quality
+
+
+def _synth_key(
+    soundfont_path: str, sample_rate: int, gain: float
+) -> tuple[str, int, float]:
+    return (str(Path(soundfont_path).resolve()), int(sample_rate), float(gain))
+
+
+def preload_soundfont(
+    soundfont_path: str | None, sample_rate: int = 44100, gain: float = 0.4
+) -> bool:
+    """
+    Load the SoundFont into a FluidSynth instance that every later
+    full-quality render in this process (and in processes forked from
+    it) reuses, instead of loading the .sf2 per render.
+    Returns False when full quality is unavailable.
+    """
+    if not _fluidsynth_available(soundfont_path):
+        return False
+    key = _synth_key(soundfont_path, sample_rate, gain)
+    if key not in _SYNTHS:
+        import fluidsynth
+
+        synth = fluidsynth.Synth(gain=gain, samplerate=float(sample_rate))
+        sfid = synth.sfload(soundfont_path)
+        _SYNTHS[key] = (synth, sfid, threading.Lock())
+    return True
+
+
+@instrumented("wav.synth")
+def render_tracks_to_wav(
+    tracks: list[NoteTrack],
+    wav_path: str,
+    soundfont_path: str | None = None,
+    quality: str = "full",
+    sample_rate: int = 44100,
+    sample_format: str = "int16",
+    block_size: int = 4096
+) -> str:
+    """
+    Render note tracks to WAV at the requested quality tier.
+
+    "full" synthesizes with FluidSynth and the SoundFont; "preview" uses
+    the built-in NumPy synthesizer. Full quality falls back to preview
+    when the SoundFont or FluidSynth is missing.
+    """
+    if resolve_quality(quality, soundfont_path) == "full":
+        return _render_fluidsynth(
+            tracks,
+            wav_path,
+            soundfont_path,
+            sample_rate=sample_rate,
+            sample_format=sample_format,
+            block_size=block_size
+        )
+
+    return render_preview_to_wav(
+        tracks,
+        wav_path,
+        sample_rate=sample_rate,
+        sample_format=sample_format,
+        block_size=block_size
+    )
+
+
+def _render_fluidsynth(
+    tracks: list[NoteTrack],
+    wav_path: str,
+    soundfont_path: str,
+    sample_rate: int = 44100,
+    sample_format: str = "int16",
+    channels: int = 1,
+    block_size: int = 4096,
+    gain: float = 0.4,
+    tail_seconds: float = 1.0
+) -> str:
+    """
+    Stream note tracks through FluidSynth into an integer-PCM WAV file.
+
+    Audio is synthesized in blocks of at most block_size frames between
+    note events and written as it is produced, so memory does not grow
+    with the length of the piece. FluidSynth renders 16-bit samples;
+    int24 output stores them in a 24-bit container. A synth preloaded by
+    preload_soundfont is reused; otherwise one is created per render.
+    """
+    warm = _SYNTHS.get(_synth_key(soundfont_path, sample_rate, gain))
+    if warm is not None:
+        synth, sfid, lock = warm
+        with lock:
+            try:
+                return _stream_fluidsynth(
+                    synth, sfid, tracks, wav_path, sample_rate, sample_format,
+                    channels, block_size, tail_seconds
+                )
+            finally:
+                # Cut release and reverb tails so the next render starts silent
+                for ch in range(16):
+                    synth.all_sounds_off(ch)
+
+    import fluidsynth
+
+    synth = fluidsynth.Synth(gain=gain, samplerate=float(sample_rate))
+    try:
+        sfid = synth.sfload(soundfont_path)
+        return _stream_fluidsynth(
+            synth, sfid, tracks, wav_path, sample_rate, sample_format,
+            channels, block_size, tail_seconds
+        )
+    finally:
+        synth.delete()
+
+
+def _stream_fluidsynth(
+    synth,
+    sfid: int,
+    tracks: list[NoteTrack],
+    wav_path: str,
+    sample_rate: int,
+    sample_format: str,
+    channels: int,
+    block_size: int,
+    tail_seconds: float
+) -> str:
+    """
+    Program the synth for the score and stream it block by block.
+    """
+    for track in tracks:
+        bank = 128 if track.is_drum else 0
+        program = 0 if track.is_drum else track.program
+        synth.program_select(track.channel, sfid, bank, program)
+
+    frames, is_on, chans, pitches, velocities = _event_schedule(tracks, sample_rate)
+    last_frame = int(frames[-1]) if len(frames) else 0
+    end_frame = last_frame + int(tail_seconds * sample_rate)
+
+    with WavWriter(wav_path, sample_rate, channels, sample_format) as writer:
+
+        def synthesize_until(target: int):
+            while writer.frames_written < target:
+                n = min(block_size, target - writer.frames_written)
+                stereo = synth.get_samples(n).reshape(-1, 2) / 32768.0
+                writer.write(stereo.mean(axis=1) if channels == 1 else stereo)
+
+        for frame, on, ch, pitch, vel in zip(frames, is_on, chans, pitches, velocities):
+            synthesize_until(int(frame))
+            if on:
+                synth.noteon(int(ch), int(pitch), int(vel))
+            else:
+                synth.noteoff(int(ch), int(pitch))
+
+        synthesize_until(end_frame)
+
+    return wav_path
 
 
 def render_midi_to_wav(
     midi_path: str,
     wav_path: str,
-    soundfont_path: str
+    soundfont_path: str | None = None,
+    quality: str = "full",
+    sample_rate: int = 44100,
+    sample_format: str = "int16",
+    block_size: int = 4096,
+    cache: RenderCache | None = None
 ) -> str:
     """
     Converts a MIDI file to WAV using the given SoundFont.
@@ -15,12 +242,31 @@ def render_midi_to_wav(
         midi_path: path to the input MIDI file
         wav_path: path to the output WAV file
         soundfont_path: path to a .sf2 SoundFont file
+        quality: "full" (FluidSynth) or "preview" (built-in synth)
+        sample_rate: output sample rate in Hz
+        sample_format: "int16" or "int24" PCM
+        block_size: frames synthesized per block
+        cache: optional RenderCache reused when the MIDI is unchanged
 
     Returns:
         Path to the WAV file.
     """
-    midi = pretty_midi.PrettyMIDI(midi_path)
-    audio = midi.fluidsynth(fs=44100, sf2_path=soundfont_path)
-
-    wavfile.write(wav_path, 44100, audio)
-    return wav_path
+    quality = resolve_quality(quality, soundfont_path)
+    return render_with_cache(
+        cache,
+        midi_path,
+        wav_path,
+        lambda: render_tracks_to_wav(
+            load_tracks(midi_path),
+            wav_path,
+            soundfont_path,
+            quality=quality,
+            sample_rate=sample_rate,
+            sample_format=sample_format,
+            block_size=block_size
+        ),
+        soundfont_path=soundfont_path,
+        sample_rate=sample_rate,
+        sample_format=sample_format,
+        quality=quality
+    )
@@ -0,0 +1,135 @@
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Optional
+
+from music_of_the_day.instrumentation import instrumented
+
+
+def soundfont_identity(soundfont_path: Optional[str]) -> str:
+    """
+    Cheap identity for a SoundFont: resolved path, size and mtime.
+    Avoids hashing a large .sf2 on every render.
+    """
+    if not soundfont_path or not Path(soundfont_path).exists():
+        return "missing"
+    path = Path(soundfont_path).resolve()
+    stat = path.stat()
+    return f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+
+
+class RenderCache:
+    """
+    Content-addressed cache of rendered WAV files.
+
+    Entries are keyed by the MIDI bytes and everything else that affects
+    the audio. A hit hardlinks (or copies) the cached file into place;
+    least recently used entries are evicted beyond max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "data/cache/audio",
+        max_bytes: int = 2 * 1024 ** 3
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def key(
+        self,
+        midi_bytes: bytes,
+        soundfont_path: Optional[str],
+        sample_rate: int,
+        sample_format: str,
+        quality: str
+    ) -> str:
+        h = hashlib.sha256(midi_bytes)
+        # The preview synth ignores the SoundFont, so it is not part of its key
+        sf = soundfont_identity(soundfont_path) if quality == "full" else "-"
+        h.update(f"|{sf}|{sample_rate}|{sample_format}|{quality}".encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.wav"
+
+    def fetch(self, key: str, dest: str | Path) -> bool:
+        """
+        Place the cached render for key at dest. Returns False on a miss.
+        """
+        cached = self._path(key)
+        if not cached.exists():
+            return False
+
+        os.utime(cached)  # mark as recently used
+        dest = Path(dest)
+        dest.unlink(missing_ok=True)
+        try:
+            os.link(cached, dest)
+        except OSError:
+            shutil.copyfile(cached, dest)
+        return True
+
+    def store(self, key: str, src: str | Path):
+        """
+        Copy a fresh render into the cache, then enforce the size bound.
+        Copying (not linking) keeps the entry safe if src is later rewritten.
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        cached = self._path(key)
+        tmp_path = cached.with_suffix(f".{os.getpid()}.tmp")
+        shutil.copyfile(src, tmp_path)
+        os.replace(tmp_path, cached)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for path in self.cache_dir.glob("*.wav"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue  # evicted by another worker since the glob
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+@instrumented("wav")
+def render_with_cache(
+    cache: Optional[RenderCache],
+    midi_path: str,
+    wav_path: str,
+    render: Callable[[], str],
+    soundfont_path: Optional[str],
+    sample_rate: int,
+    sample_format: str,
+    quality: str
+) -> str:
+    """
+    Serve wav_path from the cache when the same MIDI was rendered with the
+    same settings before; otherwise call render() and cache its output.
+    quality must be the tier render() actually uses (see resolve_quality).
+    """
+    if cache is None:
+        return render()
+
+    key = cache.key(
+        Path(midi_path).read_bytes(),
+        soundfont_path,
+        sample_rate,
+        sample_format,
+        quality
+    )
+    if cache.fetch(key, wav_path):
+        return wav_path
+
+    # A previous hit may have hardlinked wav_path to a cache entry;
+    # unlink it so the new render cannot write through into the cache.
+    Path(wav_path).unlink(missing_ok=True)
+    render()
+    cache.store(key, wav_path)
+    return wav_path
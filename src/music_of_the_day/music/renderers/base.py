@@ -1,11 +1,33 @@
-import pretty_midi
+import numpy as np
 from abc import ABC, abstractmethod
 from music_of_the_day.mapping.music_intent import MusicIntent
+from music_of_the_day.music.events import NoteTrack, make_notes
 
 class InstrumentRenderer(ABC):
 
-    def __init__(self, program: int, name: str):
-        self.instrument = pretty_midi.Instrument(program=program, name=name)
+    def __init__(self, program: int, name: str, seed=None, is_drum: bool = False):
+        self.track = NoteTrack(name=name, program=program, is_drum=is_drum)
+        # Anything np.random.default_rng accepts: None, an int or a SeedSequence
+        self.rng = np.random.default_rng(seed)
+
+    @property
+    def instrument(self):
+        """
+        The rendered track as a pretty_midi.Instrument (compatibility only).
+        """
+        return self.track.to_pretty_midi()
+
+    def add_notes(
+        self,
+        pitches: np.ndarray,
+        velocities: np.ndarray,
+        starts: np.ndarray,
+        ends: np.ndarray
+    ):
+        """
+        Append note arrays computed for the whole intent to the track.
+        """
+        self.track.extend(make_notes(pitches, velocities, starts, ends))
 
     @abstractmethod
     def render(self, intent: MusicIntent):
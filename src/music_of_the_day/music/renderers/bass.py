@@ -1,25 +1,26 @@
-import pretty_midi
+import numpy as np
 from music_of_the_day.music.renderers.base import InstrumentRenderer
+from music_of_the_day.music.renderers.registry import register_renderer
 
+@register_renderer("bass")
 class BassRenderer(InstrumentRenderer):
 
-    def __init__(self):
-        super().__init__(program=32, name="Bass")
+    def __init__(self, seed=None):
+        super().__init__(program=32, name="Bass", seed=seed)
 
     def render(self, intent):
         root = 48
         T = len(intent.intensity_curve)
         dt = intent.duration_seconds / T
 
-        for i in range(0, T, 8):
-            if intent.intensity_curve[i] < 0.3:
-                continue
+        steps = np.arange(0, T, 8)
+        intensity = intent.intensity_curve[steps]
+        steps = steps[intensity >= 0.3]
+        intensity = intent.intensity_curve[steps]
 
-            self.instrument.notes.append(
-                pretty_midi.Note(
-                    velocity=int(30 + 40 * intent.intensity_curve[i]),
-                    pitch=root,
-                    start=i * dt,
-                    end=(i + 4) * dt
-                )
-            )
+        self.add_notes(
+            pitches=np.full(len(steps), root),
+            velocities=(30 + 40 * intensity).astype(int),
+            starts=steps * dt,
+            ends=(steps + 4) * dt
+        )
@@ -1,27 +1,25 @@
 import numpy as np
-import pretty_midi
 from music_of_the_day.music.renderers.base import InstrumentRenderer
+from music_of_the_day.music.renderers.registry import register_renderer
 
+@register_renderer("percussion")
 class PercussionRenderer(InstrumentRenderer):
 
-    def __init__(self):
-        super().__init__(program=0, name="Percussion")
-        self.instrument.is_drum = True
+    def __init__(self, seed=None):
+        super().__init__(program=0, name="Percussion", seed=seed, is_drum=True)
 
     def render(self, intent):
         T = len(intent.intensity_curve)
         dt = intent.duration_seconds / T
+        intensity = intent.intensity_curve
 
-        for i in range(T):
-            if intent.intensity_curve[i] < 0.4:
-                continue
+        # One draw per step, whether or not the step is loud enough to hit
+        hits = (intensity >= 0.4) & (self.rng.random(T) < intensity)
+        steps = np.flatnonzero(hits)
 
-            if np.random.rand() < intent.intensity_curve[i]:
-                self.instrument.notes.append(
-                    pretty_midi.Note(
-                        velocity=int(40 + 50 * intent.intensity_curve[i]),
-                        pitch=36,  # kick
-                        start=i * dt,
-                        end=i * dt + dt * 0.5
-                    )
-                )
+        self.add_notes(
+            pitches=np.full(len(steps), 36),  # kick
+            velocities=(40 + 50 * intensity[steps]).astype(int),
+            starts=steps * dt,
+            ends=steps * dt + dt * 0.5
+        )
@@ -1,29 +1,25 @@
 import numpy as np
-import pretty_midi
 from music_of_the_day.music.renderers.base import InstrumentRenderer
+from music_of_the_day.music.renderers.registry import register_renderer
 
+@register_renderer("piano")
 class PianoRenderer(InstrumentRenderer):
 
-    def __init__(self):
-        super().__init__(program=0, name="Piano")
+    def __init__(self, seed=None):
+        super().__init__(program=0, name="Piano", seed=seed)
 
     def render(self, intent):
         root = 60
         T = len(intent.intensity_curve)
         dt = intent.duration_seconds / T
 
-        for i in range(T):
-            if np.random.rand() > intent.density_curve[i]:
-                continue
+        active = self.rng.random(T) <= intent.density_curve
+        intervals = self.rng.choice([0, 3, 7, 10], size=T)
+        steps = np.flatnonzero(active)
 
-            pitch = root + np.random.choice([0, 3, 7, 10])
-            velocity = int(50 + 40 * intent.intensity_curve[i])
-
-            self.instrument.notes.append(
-                pretty_midi.Note(
-                    velocity=velocity,
-                    pitch=pitch,
-                    start=i * dt,
-                    end=i * dt + dt
-                )
-            )
+        self.add_notes(
+            pitches=root + intervals[steps],
+            velocities=(50 + 40 * intent.intensity_curve[steps]).astype(int),
+            starts=steps * dt,
+            ends=steps * dt + dt
+        )
@@ -0,0 +1,23 @@
+from music_of_the_day.music.renderers.base import InstrumentRenderer
+
+_RENDERERS: dict[str, type[InstrumentRenderer]] = {}
+
+
+def register_renderer(name: str):
+    """
+    Class decorator adding an InstrumentRenderer to the ensemble.
+    Instruments are merged into the score in registration order.
+    """
+    def decorator(cls: type[InstrumentRenderer]) -> type[InstrumentRenderer]:
+        if name in _RENDERERS and _RENDERERS[name] is not cls:
+            raise ValueError(f"Renderer '{name}' is already registered")
+        _RENDERERS[name] = cls
+        return cls
+    return decorator
+
+
+def get_renderers() -> dict[str, type[InstrumentRenderer]]:
+    """
+    Registered renderer classes by name, in registration order.
+    """
+    return dict(_RENDERERS)
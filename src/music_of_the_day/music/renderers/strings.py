@@ -1,25 +1,24 @@
-import pretty_midi
+import numpy as np
 from music_of_the_day.music.renderers.base import InstrumentRenderer
+from music_of_the_day.music.renderers.registry import register_renderer
 
+@register_renderer("strings")
 class StringsRenderer(InstrumentRenderer):
 
-    def __init__(self):
-        super().__init__(program=48, name="Strings")
+    def __init__(self, seed=None):
+        super().__init__(program=48, name="Strings", seed=seed)
 
     def render(self, intent):
         root = 60 if intent.harmonic_color != "dark" else 57
         T = len(intent.intensity_curve)
         dt = intent.duration_seconds / T
 
-        for i in range(0, T, 16):
-            tension = intent.tension_curve[i]
-            pitch = root + (7 if tension > 0.6 else 0)
+        steps = np.arange(0, T, 16)
+        tension = intent.tension_curve[steps]
 
-            self.instrument.notes.append(
-                pretty_midi.Note(
-                    velocity=int(30 + 50 * intent.intensity_curve[i]),
-                    pitch=pitch,
-                    start=i * dt,
-                    end=(i + 16) * dt
-                )
-            )
+        self.add_notes(
+            pitches=root + np.where(tension > 0.6, 7, 0),
+            velocities=(30 + 50 * intent.intensity_curve[steps]).astype(int),
+            starts=steps * dt,
+            ends=(steps + 16) * dt
+        )
@@ -0,0 +1,70 @@
+import wave
+from pathlib import Path
+
+import numpy as np
+
+SAMPLE_FORMATS = {"int16": 2, "int24": 3}
+
+
+class WavWriter:
+    """
+    Incremental integer-PCM WAV writer.
+
+    Float blocks in [-1, 1] are quantized and appended as they arrive,
+    so a file of any length is written with one block in memory.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        sample_rate: int = 44100,
+        channels: int = 1,
+        sample_format: str = "int16"
+    ):
+        if sample_format not in SAMPLE_FORMATS:
+            raise ValueError(
+                f"Unsupported sample format '{sample_format}', "
+                f"expected one of {sorted(SAMPLE_FORMATS)}"
+            )
+        self.path = Path(path)
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.sample_format = sample_format
+        self.frames_written = 0
+
+        self._wav = wave.open(str(self.path), "wb")
+        self._wav.setnchannels(channels)
+        self._wav.setsampwidth(SAMPLE_FORMATS[sample_format])
+        self._wav.setframerate(sample_rate)
+
+    def write(self, block: np.ndarray):
+        """
+        Append a (frames,) or (frames, channels) float block.
+        """
+        block = np.asarray(block, dtype=np.float64)
+        if block.ndim == 1:
+            block = block[:, None]
+        if block.shape[1] != self.channels:
+            raise ValueError(
+                f"Block has {block.shape[1]} channel(s), writer expects {self.channels}"
+            )
+
+        block = np.clip(block, -1.0, 1.0)
+        if self.sample_format == "int16":
+            pcm = np.round(block * 32767).astype("<i2").tobytes()
+        else:
+            samples = np.round(block * 8388607).astype("<i4")
+            # Keep the low three bytes of each little-endian int32
+            pcm = samples.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+
+        self._wav.writeframesraw(pcm)
+        self.frames_written += len(block)
+
+    def close(self):
+        self._wav.close()  # patches the header with the final frame count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,26 +1,57 @@
+from datetime import date
+from pathlib import Path
+from typing import Iterable
+
 import numpy as np
 
 from music_of_the_day.semantics.embed import EmbeddingEngine
+from music_of_the_day.semantics.storage.article_index import ArticleIndex
+from music_of_the_day.semantics.storage.articles import ArticleArchiveWriter
+from music_of_the_day.semantics.streaming import DailyAccumulator
+from music_of_the_day.semantics.topics import TopicEngine
 from music_of_the_day.semantics.features import (
     aggregate_daily_embedding,
     extract_semantic_features
 )
 from music_of_the_day.mapping.semantics_to_intent import build_intent
+from music_of_the_day.music.ensemble import intent_seed, render_ensemble
+from music_of_the_day.music.render import render_tracks_to_wav, resolve_quality
+from music_of_the_day.music.render_cache import RenderCache, render_with_cache
+from music_of_the_day.explain.explanation import generate_explanation
+from music_of_the_day.explain.snapshot import write_features_json
+
+DEFAULT_SOUNDFONT = "assets/soundfonts/FluidR3_GM.sf2"
 
 def run_pipeline(
     articles: list[str],
     rolling_embeddings: np.ndarray | None = None,
     embedding_yesterday: np.ndarray | None = None,
     velocity_yesterday: float | None = None,
-    emotion_yesterday=None
+    emotion_yesterday=None,
+    embedder: EmbeddingEngine | None = None,
+    topic_engine: TopicEngine | None = None,
+    article_index: ArticleIndex | None = None,
+    day: date | None = None,
+    archive: ArticleArchiveWriter | None = None,
+    embeddings: np.ndarray | None = None,
+    update_index: bool = True
 ):
     """
     Semantic → music mapping pipeline.
+    Today's articles are added to article_index and archive (in memory;
+    the caller saves them) once novelty has been measured; with
+    update_index=False the index is only searched. Passing precomputed
+    embeddings, e.g. from the article archive, skips the model.
     """
 
-    # --- Step 1: Compute embeddings ---
-    embedder = EmbeddingEngine()
-    embeddings_today = embedder.embed(articles)
+    # --- Step 1: Compute embeddings (model is shared process-wide) ---
+    if embeddings is not None:
+        embeddings_today = embeddings
+    else:
+        embedder = embedder or EmbeddingEngine()
+        embeddings_today = embedder.embed(articles)
+        if archive is not None:
+            archive.append(articles, embeddings_today)
 
     # --- Step 2: Aggregate daily embedding ---
     daily_embedding = aggregate_daily_embedding(embeddings_today)
@@ -32,10 +63,134 @@ def run_pipeline(
         rolling_embeddings=rolling_embeddings,
         embedding_yesterday=embedding_yesterday,
         velocity_yesterday=velocity_yesterday,
-        emotion_yesterday=emotion_yesterday
+        emotion_yesterday=emotion_yesterday,
+        topic_engine=topic_engine,
+        article_index=article_index,
+        day=day
+    )
+    if article_index is not None and update_index:
+        article_index.add(embeddings_today, day)
+
+    # --- Step 4: Map semantics → music ---
+    intent = build_intent(features)
+
+    return features, intent, daily_embedding
+
+
+def run_streaming_pipeline(
+    articles: Iterable[str],
+    rolling_embeddings: np.ndarray | None = None,
+    embedding_yesterday: np.ndarray | None = None,
+    velocity_yesterday: float | None = None,
+    emotion_yesterday=None,
+    embedder: EmbeddingEngine | None = None,
+    topic_engine: TopicEngine | None = None,
+    article_index: ArticleIndex | None = None,
+    day: date | None = None,
+    archive: ArticleArchiveWriter | None = None,
+    batch_size: int = 64,
+    sample_size: int = 2048
+):
+    """
+    Semantic → music pipeline over a lazy article stream.
+    Articles are embedded in micro-batches while they are still being
+    fetched; only the running daily aggregates are kept in memory, so
+    only the reservoir sample is added to article_index. Every batch is
+    quantized into archive as it arrives.
+    Returns None if the stream yielded no articles.
+    """
+
+    # --- Step 1: Embed batches as they arrive ---
+    embedder = embedder or EmbeddingEngine()
+    accumulator = DailyAccumulator(sample_size=sample_size)
+    for batch, embeddings in embedder.embed_batches(articles, batch_size=batch_size):
+        accumulator.update(embeddings)
+        if archive is not None:
+            archive.append(batch, embeddings)
+
+    if accumulator.count == 0:
+        return None
+
+    # --- Step 2: Daily embedding from the running sum ---
+    daily_embedding = accumulator.mean
+
+    # --- Step 3: Extract semantic + emotional features ---
+    features = extract_semantic_features(
+        embeddings_today=accumulator.sample,
+        daily_embedding_today=daily_embedding,
+        rolling_embeddings=rolling_embeddings,
+        embedding_yesterday=embedding_yesterday,
+        velocity_yesterday=velocity_yesterday,
+        emotion_yesterday=emotion_yesterday,
+        topic_engine=topic_engine,
+        article_index=article_index,
+        day=day
     )
+    if article_index is not None:
+        article_index.add(accumulator.sample, day)
 
     # --- Step 4: Map semantics → music ---
     intent = build_intent(features)
 
     return features, intent, daily_embedding
+
+
+def render_outputs(
+    features,
+    intent,
+    out_dir: str | Path,
+    soundfont_path: str = DEFAULT_SOUNDFONT,
+    quality: str = "full",
+    cache: RenderCache | None = None,
+    seed: int | None = None
+) -> dict[str, Path]:
+    """
+    Write one day's MIDI, WAV, explanation and features.json into out_dir.
+    Depends only on its arguments, so days can be rendered in any order.
+    Without a seed, one is derived from the intent: re-rendering the same
+    intent writes the same MIDI, which is what lets the render cache hit.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = {
+        "midi": out_dir / "music.mid",
+        "wav": out_dir / "music.wav",
+        "explanation": out_dir / "explanation.txt",
+        "features": out_dir / "features.json",
+    }
+
+    # --- Generate MIDI ---
+    tracks = render_ensemble(
+        intent=intent,
+        output_path=str(paths["midi"]),
+        seed=intent_seed(intent) if seed is None else seed
+    )
+
+    # --- Render WAV straight from the note arrays (streamed, int16 PCM),
+    #     or reuse a cached render of byte-identical MIDI ---
+    sample_rate, sample_format = 44100, "int16"
+    quality = resolve_quality(quality, soundfont_path)
+    render_with_cache(
+        cache,
+        str(paths["midi"]),
+        str(paths["wav"]),
+        lambda: render_tracks_to_wav(
+            tracks,
+            wav_path=str(paths["wav"]),
+            soundfont_path=soundfont_path,
+            quality=quality,
+            sample_rate=sample_rate,
+            sample_format=sample_format
+        ),
+        soundfont_path=soundfont_path,
+        sample_rate=sample_rate,
+        sample_format=sample_format,
+        quality=quality
+    )
+
+    # --- Generate explanation ---
+    explanation = generate_explanation(features, intent)
+    paths["explanation"].write_text(explanation)
+    write_features_json(features, intent, paths["features"])
+
+    return paths
@@ -1,50 +1,116 @@
-from sentence_transformers import SentenceTransformer
 import numpy as np
 from pathlib import Path
 import hashlib
+import os
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+from music_of_the_day.instrumentation import instrumented
+from music_of_the_day.semantics.models import get_model
 
 
 class EmbeddingEngine:
     def __init__(
         self,
         model_name: str = "all-mpnet-base-v2",
-        cache_dir: str = "data/cache/embeddings"
+        cache_dir: str = "data/cache/embeddings",
+        device: Optional[str] = None
     ):
-        self.model = SentenceTransformer(model_name)
+        self.model_name = model_name
+        # Shared across engines: only the first one pays the load cost
+        self.model = get_model(model_name, device)
         self.cache_dir = Path(cache_dir)
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
 
-    def _hash_texts(self, texts):
-        joined = "||".join(texts)
-        return hashlib.md5(joined.encode()).hexdigest()
+    def _hash_text(self, text: str) -> str:
+        """
+        Content address of a single (already normalized) article.
+        The model name is part of the key so switching models never
+        serves stale vectors.
+        """
+        key = f"{self.model_name}||{text}"
+        return hashlib.md5(key.encode()).hexdigest()
+
+    def _cache_path(self, text_hash: str) -> Path:
+        return self.cache_dir / f"{text_hash}.npy"
 
+    def _write_cache(self, path: Path, row: np.ndarray):
+        # Written under a per-process name and renamed, so a crash never
+        # leaves a truncated .npy and concurrent writers never interleave
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            np.save(f, row)
+        os.replace(tmp_path, path)
+
+    @instrumented("embed", items=len)
     def embed(self, texts, use_cache: bool = True) -> np.ndarray:
         """
         Returns embeddings as a 2D array: [num_texts, embedding_dim].
-        Prevents 3D arrays from nested lists.
+
+        Each article is cached individually, so a batch that shares most
+        of its stories with a previous run only encodes the new ones.
         """
         if not isinstance(texts, list):
             raise ValueError("Input must be a list of strings")
         if len(texts) == 0:
             return np.zeros((0, self.model.get_sentence_embedding_dimension()))
 
-        cache_key = self._hash_texts(texts)
-        cache_path = self.cache_dir / f"{cache_key}.npy"
+        hashes = [self._hash_text(t) for t in texts]
+        paths = [self._cache_path(h) for h in hashes]
+
+        # --- Cache hits ---
+        hit_idx = []
+        if use_cache:
+            hit_idx = [i for i, p in enumerate(paths) if p.exists()]
+        hit_set = set(hit_idx)
+        miss_idx = [i for i in range(len(texts)) if i not in hit_set]
 
-        if use_cache and cache_path.exists():
-            embeddings = np.load(cache_path)
-        else:
-            embeddings = self.model.encode(
-                texts,
-                show_progress_bar=False,
-                normalize_embeddings=True
+        cached = [np.load(paths[i]) for i in hit_idx]
+
+        # --- Encode all misses in a single batch, each distinct text once ---
+        encoded = None
+        if miss_idx:
+            unique = {}
+            for i in miss_idx:
+                unique.setdefault(hashes[i], i)
+            encoded = np.asarray(
+                self.model.encode(
+                    [texts[i] for i in unique.values()],
+                    show_progress_bar=False,
+                    normalize_embeddings=True
+                )
             )
-            np.save(cache_path, embeddings)
-
-        # Ensure 2D array
-        if embeddings.ndim == 1:
-            embeddings = embeddings.reshape(1, -1)
-        elif embeddings.ndim > 2:
-            embeddings = embeddings.squeeze()
-        
+            if encoded.ndim == 1:
+                encoded = encoded.reshape(1, -1)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for row, i in zip(encoded, unique.values()):
+                self._write_cache(paths[i], row)
+            row_of = {h: r for r, h in enumerate(unique)}
+            encoded = encoded[[row_of[hashes[i]] for i in miss_idx]]
+
+        # --- Reassemble in input order ---
+        dim = encoded.shape[1] if encoded is not None else cached[0].shape[-1]
+        dtype = encoded.dtype if encoded is not None else cached[0].dtype
+        embeddings = np.empty((len(texts), dim), dtype=dtype)
+        if hit_idx:
+            embeddings[hit_idx] = np.stack(cached)
+        if miss_idx:
+            embeddings[miss_idx] = encoded
+
         return embeddings
+
+    def embed_batches(
+        self,
+        texts: Iterable[str],
+        batch_size: int = 64,
+        use_cache: bool = True
+    ) -> Iterator[tuple[list[str], np.ndarray]]:
+        """
+        Consume texts lazily and yield (batch_texts, embeddings) pairs of at
+        most batch_size rows, so only one batch is held in memory at a time.
+        """
+        it = iter(texts)
+        while True:
+            batch = list(islice(it, batch_size))
+            if not batch:
+                return
+            yield batch, self.embed(batch, use_cache=use_cache)
@@ -1,10 +1,20 @@
 import numpy as np
-from sklearn.metrics.pairwise import cosine_similarity, cosine_distances
-from sklearn.cluster import KMeans
 from dataclasses import dataclass
+from datetime import date
 from typing import Optional
 
+from music_of_the_day.instrumentation import instrumented
 from music_of_the_day.semantics.emotion import EmotionState, update_emotion
+from music_of_the_day.semantics.kernels import (
+    compute_day_metrics,
+    cosine_distances_to,
+    mean_pairwise_cosine_distance
+)
+from music_of_the_day.semantics.storage.article_index import (
+    ArticleIndex,
+    compute_archive_novelty
+)
+from music_of_the_day.semantics.topics import TopicEngine
 
 
 @dataclass
@@ -19,6 +29,7 @@ class SemanticFeatures:
     intra_day_dispersion: float
     narrative_phase: str
     emotion: EmotionState
+    topic_continuity: Optional[float] = None
 
 
 def aggregate_daily_embedding(
@@ -33,21 +44,21 @@ def aggregate_daily_embedding(
 def compute_semantic_shift(today: np.ndarray, rolling_mean: Optional[np.ndarray]) -> float:
     if rolling_mean is None:
         return 0.0
-    return float(1 - cosine_similarity([today], [rolling_mean])[0][0])
+    return float(cosine_distances_to(today, rolling_mean)[0])
 
 
 def compute_semantic_novelty(today: np.ndarray, rolling_embeddings: Optional[np.ndarray]) -> float:
     if rolling_embeddings is None or len(rolling_embeddings) == 0:
         return 0.0
-    distances = cosine_distances([today], rolling_embeddings)[0]
+    distances = cosine_distances_to(today, rolling_embeddings)
     return float(np.percentile(distances, 90))
 
 
 def cluster_topics(embeddings: np.ndarray, k: int) -> np.ndarray:
-    if len(embeddings) < k:
-        k = max(1, len(embeddings))
-    model = KMeans(n_clusters=k, n_init=10, random_state=42)
-    return model.fit_predict(embeddings)
+    """
+    Cold-start clustering with no memory of previous days.
+    """
+    return TopicEngine(k=k).fit(embeddings).labels
 
 
 def compute_topic_entropy(cluster_labels: np.ndarray) -> float:
@@ -58,10 +69,10 @@ def compute_topic_entropy(cluster_labels: np.ndarray) -> float:
 
 
 def compute_intra_day_dispersion(embeddings: np.ndarray) -> float:
-    if len(embeddings) < 2:
-        return 0.0
-    distances = cosine_distances(embeddings)
-    return float(distances.mean())
+    """
+    Mean pairwise cosine distance, exact and linear in N.
+    """
+    return mean_pairwise_cosine_distance(embeddings)
 
 
 def classify_narrative_phase(velocity: float, acceleration: float, entropy: float) -> str:
@@ -74,6 +85,7 @@ def classify_narrative_phase(velocity: float, acceleration: float, entropy: floa
     return "stasis"
 
 
+@instrumented("features")
 def extract_semantic_features(
     embeddings_today: np.ndarray,
     daily_embedding_today: np.ndarray,
@@ -81,30 +93,39 @@ def extract_semantic_features(
     embedding_yesterday: Optional[np.ndarray] = None,
     velocity_yesterday: Optional[float] = None,
     emotion_yesterday: Optional[EmotionState] = None,
-    num_clusters: int = 4
+    num_clusters: int = 4,
+    topic_engine: Optional[TopicEngine] = None,
+    article_index: Optional[ArticleIndex] = None,
+    day: Optional[date] = None
 ) -> SemanticFeatures:
 
-    rolling_mean = rolling_embeddings.mean(axis=0) if rolling_embeddings is not None else None
-
-    semantic_shift = compute_semantic_shift(daily_embedding_today, rolling_mean)
-    semantic_novelty = compute_semantic_novelty(daily_embedding_today, rolling_embeddings)
-
-    cluster_labels = cluster_topics(embeddings_today, num_clusters)
+    metrics = compute_day_metrics(
+        embeddings_today,
+        daily_embedding_today,
+        rolling_embeddings=rolling_embeddings,
+        embedding_yesterday=embedding_yesterday
+    )
+    semantic_shift = metrics.semantic_shift
+    semantic_novelty = metrics.semantic_novelty
+    semantic_velocity = metrics.semantic_velocity
+    intra_day_dispersion = metrics.intra_day_dispersion
+
+    # With an article index, novelty is nearest-neighbour distance against
+    # every past article rather than against the daily means
+    if article_index is not None:
+        archive_novelty = compute_archive_novelty(embeddings_today, article_index, day)
+        if archive_novelty is not None:
+            semantic_novelty = archive_novelty
+
+    topic_engine = topic_engine or TopicEngine(k=num_clusters)
+    topics = topic_engine.fit(embeddings_today)
+    cluster_labels = topics.labels
     counts = np.bincount(cluster_labels)
 
     num_topics = len(np.unique(cluster_labels))
     topic_dominance = float(counts.max() / counts.sum())
     topic_entropy = compute_topic_entropy(cluster_labels)
 
-    intra_day_dispersion = compute_intra_day_dispersion(embeddings_today)
-
-    if embedding_yesterday is not None:
-        semantic_velocity = float(
-            cosine_distances([daily_embedding_today], [embedding_yesterday])[0][0]
-        )
-    else:
-        semantic_velocity = 0.0
-
     if velocity_yesterday is not None:
         semantic_acceleration = semantic_velocity - velocity_yesterday
     else:
@@ -133,5 +154,6 @@ def extract_semantic_features(
         semantic_acceleration=semantic_acceleration,
         intra_day_dispersion=intra_day_dispersion,
         narrative_phase=narrative_phase,
-        emotion=emotion
+        emotion=emotion,
+        topic_continuity=topics.continuity
     )
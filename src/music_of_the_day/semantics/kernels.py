@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+def normalize_rows(x: np.ndarray) -> np.ndarray:
+    """
+    Scale each row to unit length; all-zero rows are left at zero.
+    """
+    x = np.atleast_2d(np.asarray(x, dtype=np.float64))
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return np.divide(x, norms, out=np.zeros_like(x), where=norms > 0)
+
+
+def mean_pairwise_cosine_distance(
+    embeddings: np.ndarray,
+    assume_normalized: bool = False
+) -> float:
+    """
+    Mean of the full N x N cosine distance matrix in O(N * D).
+
+    For unit vectors u_i with mean m, sum_ij u_i . u_j = N^2 |m|^2, so the
+    mean distance (diagonal included, as in sklearn's matrix) is
+    1 - |m|^2 without ever building the matrix.
+    """
+    x = np.asarray(embeddings)
+    if not np.issubdtype(x.dtype, np.floating):
+        x = x.astype(np.float64)
+    n = len(x)
+    if n < 2:
+        return 0.0
+
+    if assume_normalized:
+        unit_sum = x.sum(axis=0, dtype=np.float64)
+    else:
+        # sum_i x_i / |x_i| as one vector-matrix product; no normalized copy
+        sq_norms = np.einsum("ij,ij->i", x, x)
+        inv = np.divide(1.0, np.sqrt(sq_norms), out=np.zeros(n), where=sq_norms > 0)
+        unit_sum = (inv.astype(x.dtype) @ x).astype(np.float64)
+
+    mean = unit_sum / n
+    return float(np.clip(1.0 - mean @ mean, 0.0, 2.0))
+
+
+def cosine_distances_to(
+    vector: np.ndarray,
+    matrix: np.ndarray,
+    assume_normalized: bool = False
+) -> np.ndarray:
+    """
+    Cosine distance from one vector to every row of matrix, as a single
+    matrix-vector product.
+    """
+    if not assume_normalized:
+        vector = normalize_rows(vector)[0]
+        matrix = normalize_rows(matrix)
+    return np.clip(1.0 - matrix @ vector, 0.0, 2.0)
+
+
+@dataclass
+class DayMetrics:
+    semantic_shift: float
+    semantic_novelty: float
+    semantic_velocity: float
+    intra_day_dispersion: float
+
+
+def compute_day_metrics(
+    embeddings_today: np.ndarray,
+    daily_embedding_today: np.ndarray,
+    rolling_embeddings: Optional[np.ndarray] = None,
+    embedding_yesterday: Optional[np.ndarray] = None,
+    assume_normalized: bool = False
+) -> DayMetrics:
+    """
+    All distance-based day metrics from one fused pass.
+
+    The rolling mean, yesterday's embedding and the rolling history are
+    stacked into a single reference matrix and compared with today's
+    embedding in one product; dispersion uses the mean-vector identity.
+    """
+    refs = []
+    if rolling_embeddings is not None and len(rolling_embeddings) > 0:
+        rolling_embeddings = np.atleast_2d(rolling_embeddings)
+        refs.append(rolling_embeddings.mean(axis=0, keepdims=True))
+        refs.append(rolling_embeddings)
+    if embedding_yesterday is not None:
+        refs.append(np.atleast_2d(embedding_yesterday))
+
+    shift = novelty = velocity = 0.0
+    if refs:
+        distances = cosine_distances_to(daily_embedding_today, np.vstack(refs))
+        pos = 0
+        if rolling_embeddings is not None and len(rolling_embeddings) > 0:
+            shift = float(distances[0])
+            n = len(rolling_embeddings)
+            novelty = float(np.percentile(distances[1:1 + n], 90))
+            pos = 1 + n
+        if embedding_yesterday is not None:
+            velocity = float(distances[pos])
+
+    dispersion = mean_pairwise_cosine_distance(embeddings_today, assume_normalized)
+    return DayMetrics(
+        semantic_shift=shift,
+        semantic_novelty=novelty,
+        semantic_velocity=velocity,
+        intra_day_dispersion=dispersion
+    )
@@ -0,0 +1,76 @@
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from music_of_the_day.instrumentation import span
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+_MODELS: dict[tuple[str, Optional[str]], "SentenceTransformer"] = {}
+_LOCK = threading.Lock()
+
+
+def get_model(
+    model_name: str = "all-mpnet-base-v2",
+    device: Optional[str] = None
+) -> "SentenceTransformer":
+    """
+    Return a process-wide SentenceTransformer for (model_name, device).
+    The model is loaded on first use and reused by every later caller;
+    sentence_transformers (and torch) are only imported at that point.
+    """
+    key = (model_name, device)
+    model = _MODELS.get(key)
+    if model is not None:
+        return model
+
+    with _LOCK:
+        # Another thread may have loaded it while we waited
+        model = _MODELS.get(key)
+        if model is None:
+            with span("model_load"):
+                from sentence_transformers import SentenceTransformer
+
+                model = SentenceTransformer(model_name, device=device)
+            _MODELS[key] = model
+    return model
+
+
+def register_model(
+    model_name: str,
+    model,
+    device: Optional[str] = None
+):
+    """
+    Serve an already-built model for (model_name, device), e.g. a stub
+    for offline tests and benchmarks. Replaces any model loaded under
+    that key; unload_model releases it again.
+    """
+    with _LOCK:
+        _MODELS[(model_name, device)] = model
+
+
+def unload_model(
+    model_name: Optional[str] = None,
+    device: Optional[str] = None
+) -> int:
+    """
+    Drop cached models so their memory can be reclaimed.
+    With no model_name, every loaded model is released.
+    Returns the number of models unloaded.
+    """
+    with _LOCK:
+        if model_name is None:
+            keys = list(_MODELS)
+        else:
+            keys = [k for k in _MODELS if k == (model_name, device)]
+        for key in keys:
+            del _MODELS[key]
+    return len(keys)
+
+
+def loaded_models() -> list[tuple[str, Optional[str]]]:
+    """
+    List the (model_name, device) pairs currently held in memory.
+    """
+    return list(_MODELS)
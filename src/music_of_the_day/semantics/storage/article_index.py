@@ -0,0 +1,380 @@
+import json
+import os
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from music_of_the_day.semantics.kernels import normalize_rows
+from music_of_the_day.semantics.storage.articles import iter_archive
+
+BASE_DIR = Path("data/processed/article_index")
+
+VECTOR_DTYPE = np.float32
+LIST_DTYPE = np.int32
+
+_EXTENSIONS = {"vectors": "f32", "lists": "i32", "centroids": "npy"}
+
+
+class ArticleIndex:
+    """
+    Persistent inverted-file (IVF) index over every past article embedding.
+
+    Vectors are unit-normalized and assigned to their nearest coarse
+    centroid. A query only scans the nprobe lists whose centroids are
+    closest, so its cost grows with roughly sqrt(archive size) rather
+    than the archive size. The coarse quantizer is retrained whenever the
+    archive has grown 4x since the last training.
+
+    On disk, vectors and list ids are append-only files and meta.json
+    holds the committed row count and each day's row range. save() only
+    appends the days added since the last save, then replaces meta.json;
+    anything past the committed rows (a crashed append) is ignored and
+    overwritten. Retraining, or re-running so many days that most rows
+    are dead, writes a new generation of files instead.
+    """
+
+    def __init__(self, index_dir: str | Path = BASE_DIR, nprobe: int = 8):
+        self.index_dir = Path(index_dir)
+        self.nprobe = nprobe
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_size = 0
+        self.generation = 0
+        self._count = 0
+        # Committed rows loaded from disk, grouped by list via _order/_bounds
+        self._vectors = np.empty((0, 0), dtype=VECTOR_DTYPE)
+        self._row_days = np.empty(0, dtype=np.int32)  # -1 once replaced
+        self._order = np.empty(0, dtype=np.int64)
+        self._bounds = np.zeros(1, dtype=np.int64)
+        self._loaded_days: dict[int, tuple[int, int]] = {}
+        # Rows added in this process: per list, (day ordinals, vectors) chunks
+        self._memory: list[list[tuple[np.ndarray, np.ndarray]]] = []
+        # Disk bookkeeping
+        self._disk_rows = 0
+        self._disk_days: dict[int, tuple[int, int]] = {}
+        self._unsaved: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        self._rewrite = False
+        self._load()
+
+    # --- Persistence ---
+
+    def _path(self, name: str, generation: int | None = None) -> Path:
+        generation = self.generation if generation is None else generation
+        return self.index_dir / f"{name}-{generation}.{_EXTENSIONS[name]}"
+
+    def _load(self):
+        meta_path = self.index_dir / "meta.json"
+        if not meta_path.exists():
+            return
+        meta = json.loads(meta_path.read_text())
+        generation, rows = meta["generation"], meta["rows"]
+        centroids = np.load(self._path("centroids", generation))
+        dim = centroids.shape[1]
+
+        # meta.json is only replaced after the rows it counts were synced
+        vectors_path = self._path("vectors", generation)
+        lists_path = self._path("lists", generation)
+        expected = (
+            (vectors_path, rows * dim * np.dtype(VECTOR_DTYPE).itemsize),
+            (lists_path, rows * np.dtype(LIST_DTYPE).itemsize),
+        )
+        if any(not p.exists() or p.stat().st_size < size for p, size in expected):
+            print(f"⚠️ Article index in {self.index_dir} is incomplete; ignoring it")
+            return
+
+        self.generation = generation
+        self.trained_size = meta["trained_size"]
+        self.centroids = centroids
+        self._memory = [[] for _ in range(len(centroids))]
+        self._disk_rows = rows
+        self._disk_days = {
+            date.fromisoformat(day).toordinal(): tuple(span)
+            for day, span in meta["days"].items()
+        }
+        self._loaded_days = dict(self._disk_days)
+        if rows == 0:
+            return
+
+        self._vectors = np.memmap(
+            vectors_path, dtype=VECTOR_DTYPE, mode="r", shape=(rows, dim)
+        )
+        lists = np.fromfile(lists_path, dtype=LIST_DTYPE, count=rows)
+        self._row_days = np.full(rows, -1, dtype=np.int32)
+        for ordinal, (start, stop) in self._loaded_days.items():
+            self._row_days[start:stop] = ordinal
+        self._count = int((self._row_days >= 0).sum())
+
+        live = np.flatnonzero(self._row_days >= 0)
+        self._order = live[np.argsort(lists[live], kind="stable")]
+        self._bounds = np.searchsorted(
+            lists[self._order], np.arange(len(centroids) + 1)
+        )
+
+    def _write_meta(self):
+        meta = {
+            "generation": self.generation,
+            "trained_size": self.trained_size,
+            "rows": self._disk_rows,
+            "days": {
+                date.fromordinal(ordinal).isoformat(): list(span)
+                for ordinal, span in sorted(self._disk_days.items())
+            },
+        }
+        path = self.index_dir / "meta.json"
+        tmp_path = path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(meta))
+        os.replace(tmp_path, path)
+
+    def _append(self, days: list[tuple[int, np.ndarray, np.ndarray]]):
+        """
+        Append (ordinal, vectors, lists) days after the committed rows.
+        Nothing is visible to readers until meta.json is replaced.
+        """
+        dim = self.centroids.shape[1]
+        columns = (("vectors", VECTOR_DTYPE, dim, 1), ("lists", LIST_DTYPE, 1, 2))
+        for name, dtype, width, column in columns:
+            with open(self._path(name), "ab") as f:
+                # Drop any rows a crashed save appended but never committed
+                f.truncate(self._disk_rows * width * np.dtype(dtype).itemsize)
+                for day in days:
+                    f.write(np.ascontiguousarray(day[column], dtype=dtype).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+        for ordinal, vectors, _ in days:
+            self._disk_days[ordinal] = (self._disk_rows, self._disk_rows + len(vectors))
+            self._disk_rows += len(vectors)
+
+    def save(self):
+        if self.centroids is None:
+            return
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+
+        on_disk = sum(stop - start for start, stop in self._disk_days.values())
+        if self._rewrite or self._disk_rows - on_disk > self._count:
+            self._save_generation()
+        elif self._unsaved:
+            self._append([
+                (ordinal, vectors, lists)
+                for ordinal, (vectors, lists) in sorted(self._unsaved.items())
+            ])
+            self._write_meta()
+        self._unsaved.clear()
+
+    def _save_generation(self):
+        """
+        Write every live row to a fresh generation, switch meta.json to it,
+        then delete the previous generation's files.
+        """
+        old = self.generation
+        self.generation = old + 1
+        self._disk_rows, self._disk_days = 0, {}
+        for name in ("vectors", "lists"):
+            self._path(name).unlink(missing_ok=True)
+        tmp_path = self.index_dir / "centroids.tmp.npy"
+        np.save(tmp_path, self.centroids)
+        os.replace(tmp_path, self._path("centroids"))
+
+        vectors, days = self._live_rows()
+        order = np.argsort(days, kind="stable")
+        vectors, days = vectors[order], days[order]
+        lists = self._assign(vectors)
+        splits = np.flatnonzero(np.diff(days)) + 1
+        self._append([
+            (int(d[0]), v, lst)
+            for d, v, lst in zip(
+                np.split(days, splits),
+                np.split(vectors, splits),
+                np.split(lists, splits)
+            )
+            if len(d)
+        ])
+        self._write_meta()
+        self._rewrite = False
+
+        for name in _EXTENSIONS:
+            path = self._path(name, old)
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass  # still mapped (Windows); removed with a later generation
+
+    # --- Building ---
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _assign(self, units: np.ndarray) -> np.ndarray:
+        return np.argmax(units @ self.centroids.T, axis=1).astype(LIST_DTYPE)
+
+    def _train(self, units: np.ndarray):
+        from sklearn.cluster import MiniBatchKMeans
+
+        nlist = int(np.clip(np.sqrt(len(units)), 1, 1024))
+        sample = units
+        if len(units) > 50_000:
+            rng = np.random.default_rng(0)
+            sample = units[rng.choice(len(units), 50_000, replace=False)]
+        model = MiniBatchKMeans(
+            n_clusters=nlist, n_init=3, batch_size=1024, random_state=0
+        )
+        model.fit(sample)
+        self.centroids = normalize_rows(model.cluster_centers_).astype(VECTOR_DTYPE)
+        self.trained_size = len(units)
+
+    def _live_rows(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Every live (vector, day ordinal) pair, committed and in memory.
+        """
+        vectors, days = [], []
+        if len(self._order):
+            rows = np.sort(self._order)
+            rows = rows[self._row_days[rows] >= 0]
+            vectors.append(np.asarray(self._vectors[rows]))
+            days.append(self._row_days[rows])
+        for chunks in self._memory:
+            for chunk_days, chunk_vectors in chunks:
+                vectors.append(chunk_vectors)
+                days.append(chunk_days)
+        dim = self.centroids.shape[1] if self.centroids is not None else 0
+        if not vectors:
+            return np.empty((0, dim), dtype=VECTOR_DTYPE), np.empty(0, dtype=np.int32)
+        return np.vstack(vectors), np.concatenate(days)
+
+    def _insert(self, units: np.ndarray, days: np.ndarray) -> np.ndarray:
+        lists = self._assign(units)
+        order = np.argsort(lists, kind="stable")
+        bounds = np.searchsorted(lists[order], np.arange(len(self.centroids) + 1))
+        for lst in np.flatnonzero(np.diff(bounds)):
+            rows = order[bounds[lst]:bounds[lst + 1]]
+            self._memory[lst].append((days[rows], units[rows]))
+        self._count += len(units)
+        return lists
+
+    def _drop_day(self, ordinal: int):
+        if ordinal in self._loaded_days:
+            start, stop = self._loaded_days.pop(ordinal)
+            self._count -= int((self._row_days[start:stop] >= 0).sum())
+            self._row_days[start:stop] = -1
+        for lst, chunks in enumerate(self._memory):
+            kept = []
+            for chunk_days, chunk_vectors in chunks:
+                keep = chunk_days != ordinal
+                self._count -= int((~keep).sum())
+                if keep.any():
+                    kept.append((chunk_days[keep], chunk_vectors[keep]))
+            self._memory[lst] = kept
+        self._disk_days.pop(ordinal, None)
+        self._unsaved.pop(ordinal, None)
+
+    def add(self, embeddings: np.ndarray, day: date | None = None):
+        """
+        Add a day's article embeddings to the index, replacing anything
+        previously added for the same day. Costs O(day) unless the
+        quantizer is due for retraining.
+        """
+        units = normalize_rows(embeddings).astype(VECTOR_DTYPE)
+        if len(units) == 0:
+            return
+        ordinal = (day or date.today()).toordinal()
+        days = np.full(len(units), ordinal, dtype=np.int32)
+        self._drop_day(ordinal)
+
+        if self.centroids is None or self._count + len(units) >= 4 * self.trained_size:
+            live_vectors, live_days = self._live_rows()
+            units = np.vstack([live_vectors, units]) if len(live_vectors) else units
+            days = np.concatenate([live_days, days])
+            self._train(units)
+            # Everything now lives in memory, assigned to the new lists
+            self._vectors = np.empty((0, 0), dtype=VECTOR_DTYPE)
+            self._row_days = np.empty(0, dtype=np.int32)
+            self._order = np.empty(0, dtype=np.int64)
+            self._bounds = np.zeros(len(self.centroids) + 1, dtype=np.int64)
+            self._loaded_days = {}
+            self._memory = [[] for _ in range(len(self.centroids))]
+            self._count = 0
+            self._unsaved.clear()
+            self._rewrite = True
+            self._insert(units, days)
+            return
+
+        lists = self._insert(units, days)
+        self._unsaved[ordinal] = (units, lists)
+
+    # --- Querying ---
+
+    def search(
+        self,
+        queries: np.ndarray,
+        nprobe: int | None = None,
+        before: date | None = None
+    ) -> np.ndarray:
+        """
+        Approximate nearest-neighbour cosine distance for each query.
+        With before, only articles from earlier days are considered, so
+        re-running or backfilling a day never matches itself. Queries
+        with no candidate get +inf.
+        """
+        units = normalize_rows(queries).astype(VECTOR_DTYPE)
+        best = np.full(len(units), -np.inf)
+        if len(self) == 0:
+            return np.full(len(units), np.inf)
+        cutoff = before.toordinal() if before is not None else np.iinfo(np.int32).max
+
+        nprobe = min(nprobe or self.nprobe, len(self.centroids))
+        coarse = units @ self.centroids.T
+        probes = np.argpartition(-coarse, nprobe - 1, axis=1)[:, :nprobe]
+
+        # Scan each probed list once, against every query that probes it
+        for lst in np.unique(probes):
+            blocks = []
+            if len(self._order):
+                rows = self._order[self._bounds[lst]:self._bounds[lst + 1]]
+                days = self._row_days[rows]
+                rows = rows[(days >= 0) & (days < cutoff)]
+                if len(rows):
+                    blocks.append(np.asarray(self._vectors[rows]))
+            for chunk_days, chunk_vectors in self._memory[lst]:
+                blocks.append(chunk_vectors[chunk_days < cutoff])
+            block = np.vstack(blocks) if blocks else np.empty((0, units.shape[1]))
+            if len(block) == 0:
+                continue
+            asking = np.flatnonzero((probes == lst).any(axis=1))
+            sims = units[asking] @ block.T
+            best[asking] = np.maximum(best[asking], sims.max(axis=1))
+
+        distances = np.clip(1.0 - best, 0.0, 2.0)
+        distances[np.isneginf(best)] = np.inf
+        return distances
+
+
+def compute_archive_novelty(
+    embeddings_today: np.ndarray,
+    index: ArticleIndex,
+    day: date | None = None
+) -> Optional[float]:
+    """
+    Mean distance from each of today's articles to its nearest article
+    from an earlier day. None when there is no history to compare against.
+    """
+    if len(index) == 0 or len(embeddings_today) == 0:
+        return None
+    distances = index.search(embeddings_today, before=day or date.today())
+    distances = distances[np.isfinite(distances)]
+    if len(distances) == 0:
+        return None
+    return float(np.mean(distances))
+
+
+def rebuild_from_archive(
+    index: ArticleIndex,
+    start: date | None = None,
+    end: date | None = None
+) -> ArticleIndex:
+    """
+    Re-add every archived day in [start, end] to index, without the model.
+    """
+    for day, archived in iter_archive(start, end):
+        index.add(archived.embeddings, day)
+    return index
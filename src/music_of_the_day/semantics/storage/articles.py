@@ -0,0 +1,160 @@
+import hashlib
+import os
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+
+BASE_DIR = Path("data/processed/articles")
+
+ARCHIVE_FORMATS = ("int8", "float16")
+
+
+@dataclass
+class ArchivedDay:
+    ids: np.ndarray          # shape (N,) "YYYY-MM-DD:i", position within the day
+    text_hashes: np.ndarray  # shape (N,) md5 hex of each article text
+    embeddings: np.ndarray   # shape (N, D) float32, dequantized
+
+
+def hash_article(text: str) -> str:
+    return hashlib.md5(text.encode("utf-8")).hexdigest()
+
+
+def quantize(
+    embeddings: np.ndarray,
+    fmt: str = "int8"
+) -> tuple[np.ndarray, Optional[np.ndarray]]:
+    """
+    Compress embeddings to codes plus an optional per-vector scale.
+    int8 stores round(x / scale) with scale = max|x| / 127 per row;
+    float16 is a plain cast and needs no scale.
+    """
+    embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+    if fmt == "float16":
+        return embeddings.astype(np.float16), None
+    if fmt != "int8":
+        raise ValueError(
+            f"Unknown archive format {fmt!r}; expected one of {ARCHIVE_FORMATS}"
+        )
+
+    scales = np.abs(embeddings).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.rint(embeddings / scales[:, None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize(codes: np.ndarray, scales: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Inverse of quantize, as one broadcast multiply.
+    """
+    if scales is None:
+        return codes.astype(np.float32)
+    return codes.astype(np.float32) * scales[:, None]
+
+
+class ArticleArchiveWriter:
+    """
+    Collects one day's article embeddings batch by batch, quantizing each
+    batch on arrival so the full-precision day is never held in memory.
+    """
+
+    def __init__(self, day: date = None, fmt: str = "int8"):
+        if fmt not in ARCHIVE_FORMATS:
+            raise ValueError(
+                f"Unknown archive format {fmt!r}; expected one of {ARCHIVE_FORMATS}"
+            )
+        self.day = day or date.today()
+        self.fmt = fmt
+        self._codes: list[np.ndarray] = []
+        self._scales: list[np.ndarray] = []
+        self._hashes: list[str] = []
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def append(self, texts: list[str], embeddings: np.ndarray):
+        codes, scales = quantize(embeddings, self.fmt)
+        self._codes.append(codes)
+        if scales is not None:
+            self._scales.append(scales)
+        self._hashes.extend(hash_article(t) for t in texts)
+
+    def save(self) -> Optional[Path]:
+        """
+        Write the day's archive. Returns None if nothing was appended.
+        The file is replaced atomically, so a crash mid-write leaves the
+        previous archive (or none) rather than a truncated .npz.
+        """
+        if not self._hashes:
+            return None
+        day_str = self.day.isoformat()
+        # Ids and hashes are ASCII; store them as bytes, not 4-byte unicode
+        arrays = {
+            "codes": np.vstack(self._codes),
+            "ids": np.array(
+                [f"{day_str}:{i}" for i in range(len(self._hashes))], dtype="S"
+            ),
+            "text_hashes": np.array(self._hashes, dtype="S32"),
+        }
+        if self._scales:
+            arrays["scales"] = np.concatenate(self._scales)
+
+        BASE_DIR.mkdir(parents=True, exist_ok=True)
+        path = BASE_DIR / f"{day_str}.npz"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:  # a file object keeps np.savez's name
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+        return path
+
+
+def save_articles(
+    embeddings: np.ndarray,
+    texts: list[str],
+    day: date = None,
+    fmt: str = "int8"
+) -> Optional[Path]:
+    """
+    Archive a day's per-article embeddings in one call.
+    """
+    writer = ArticleArchiveWriter(day, fmt)
+    writer.append(texts, embeddings)
+    return writer.save()
+
+
+def load_articles(day: date = None) -> Optional[ArchivedDay]:
+    """
+    Load a day's archived articles. Defaults to today.
+    Returns None if the day was never archived.
+    """
+    day = day or date.today()
+    path = BASE_DIR / f"{day.isoformat()}.npz"
+    if not path.exists():
+        return None
+
+    with np.load(path) as data:
+        scales = data["scales"] if "scales" in data.files else None
+        return ArchivedDay(
+            ids=data["ids"].astype(str),
+            text_hashes=data["text_hashes"].astype(str),
+            embeddings=dequantize(data["codes"], scales)
+        )
+
+
+def archived_days() -> list[date]:
+    return sorted(date.fromisoformat(p.stem) for p in BASE_DIR.glob("*.npz"))
+
+
+def iter_archive(
+    start: date = None,
+    end: date = None
+) -> Iterator[tuple[date, ArchivedDay]]:
+    """
+    Yield (day, ArchivedDay) for every archived day in [start, end].
+    """
+    for day in archived_days():
+        if (start is None or day >= start) and (end is None or day <= end):
+            yield day, load_articles(day)
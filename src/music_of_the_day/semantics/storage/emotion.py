@@ -6,7 +6,6 @@ from typing import Optional
 from music_of_the_day.semantics.emotion import EmotionState
 
 BASE_DIR = Path("data/processed/emotion")
-BASE_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def _serialize(emotion: EmotionState) -> dict:
@@ -34,6 +33,7 @@ def save_emotion(emotion: EmotionState, day: date | str | None = None) -> Path:
     elif isinstance(day, str):
         day = datetime.fromisoformat(day).date()
 
+    BASE_DIR.mkdir(parents=True, exist_ok=True)
     path = BASE_DIR / f"{day.isoformat()}.json"
     payload = _serialize(emotion)
 
@@ -0,0 +1,428 @@
+import json
+import sqlite3
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from music_of_the_day.semantics.emotion import EmotionState
+from music_of_the_day.semantics.storage import emotion as emotion_files
+from music_of_the_day.semantics.storage import velocity as velocity_files
+
+DB_PATH = Path("data/processed/state.db")
+
+# Per-day embedding and centroid files written before the store existed.
+# Embeddings were later kept as one memory-mapped matrix in the same
+# directory (history.f32 + index.json); the migration reads both layouts.
+LEGACY_EMBEDDINGS_DIR = Path("data/processed/embeddings/rolling")
+LEGACY_TOPICS_DIR = Path("data/processed/topics")
+
+VECTOR_DTYPE = np.float32
+
+# Window lengths (in days) kept as running sums, plus the EMA weight of a new day
+ROLLING_WINDOWS = (7, 14, 90, 365)
+EMA_ALPHA = 0.2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    day        INTEGER PRIMARY KEY,  -- date ordinal
+    embedding  BLOB,                 -- float32, shape (dim,)
+    dim        INTEGER,
+    velocity   REAL,
+    valence    REAL,
+    arousal    REAL,
+    tension    REAL,
+    centroids  BLOB,                 -- float32, shape (k, dim)
+    k          INTEGER
+);
+CREATE TABLE IF NOT EXISTS window_sums (
+    length     INTEGER PRIMARY KEY,  -- window length in days
+    anchor     INTEGER NOT NULL,     -- last day (ordinal) the window covers
+    total      BLOB NOT NULL,        -- float64 sum of embeddings, shape (dim,)
+    count      INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS ema (
+    id         INTEGER PRIMARY KEY CHECK (id = 0),
+    anchor     INTEGER NOT NULL,     -- latest day (ordinal) folded in
+    value      BLOB NOT NULL,        -- float64, shape (dim,)
+    previous   BLOB NOT NULL         -- the EMA before the anchor day
+);
+"""
+
+_COLUMNS = "day, embedding, dim, velocity, valence, arousal, tension, centroids, k"
+
+
+@dataclass
+class DayState:
+    """
+    Everything one day hands over to the next.
+    """
+    day: date
+    embedding: Optional[np.ndarray] = None
+    velocity: Optional[float] = None
+    emotion: Optional[EmotionState] = None
+    centroids: Optional[np.ndarray] = None
+
+
+def _to_blob(array: Optional[np.ndarray]) -> Optional[bytes]:
+    if array is None:
+        return None
+    return np.ascontiguousarray(array, dtype=VECTOR_DTYPE).tobytes()
+
+
+def _from_blob(blob: Optional[bytes], shape: tuple) -> Optional[np.ndarray]:
+    if blob is None:
+        return None
+    return np.frombuffer(blob, dtype=VECTOR_DTYPE).reshape(shape).copy()
+
+
+def _row(state: DayState) -> tuple:
+    embedding = state.embedding
+    if embedding is not None:
+        embedding = np.asarray(embedding).reshape(-1)
+    emotion = state.emotion
+    return (
+        state.day.toordinal(),
+        _to_blob(embedding),
+        None if embedding is None else len(embedding),
+        None if state.velocity is None else float(state.velocity),
+        None if emotion is None else float(emotion.valence),
+        None if emotion is None else float(emotion.arousal),
+        None if emotion is None else float(emotion.tension),
+        _to_blob(state.centroids),
+        None if state.centroids is None else len(state.centroids),
+    )
+
+
+def _state(row: tuple) -> DayState:
+    day, embedding, dim, velocity, valence, arousal, tension, centroids, k = row
+    emotion = None
+    if valence is not None:
+        emotion = EmotionState(valence=valence, arousal=arousal, tension=tension)
+    return DayState(
+        day=date.fromordinal(day),
+        embedding=_from_blob(embedding, (dim,)),
+        velocity=velocity,
+        emotion=emotion,
+        centroids=_from_blob(centroids, (k, -1)),
+    )
+
+
+def _sum_blob(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.float64).copy()
+
+
+class StateStore:
+    """
+    Day-to-day state in one SQLite file, one row per day.
+
+    A day's embedding, velocity, emotion and topic centroids are written
+    in a single transaction, so a crash never leaves them out of step.
+    "Latest" and date ranges are single queries on the primary key.
+
+    The same transaction folds the day's embedding into running sums
+    for each of ROLLING_WINDOWS and into an EMA, so rolling averages
+    anchored at the latest day are answered in constant time. Saving
+    the day after the latest costs O(dim) per window; a gap, or a change
+    of window lengths, re-anchors the sums from the stored days.
+    """
+
+    def __init__(self, path: str | Path = DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def save_day(self, state: DayState):
+        self.save_days([state])
+
+    def save_days(self, states: list[DayState]):
+        """
+        Write several days atomically; existing days are replaced.
+        """
+        with self.conn:
+            for state in states:
+                ordinal = state.day.toordinal()
+                previous = self._embedding(ordinal)
+                self.conn.execute(
+                    f"INSERT OR REPLACE INTO days ({_COLUMNS}) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    _row(state)
+                )
+                vector = self._embedding(ordinal)
+                if vector is not None:
+                    self._fold_windows(ordinal, vector, previous)
+                    self._fold_ema(ordinal, vector, previous)
+                elif previous is not None:
+                    self._reanchor_windows()
+
+    # --- Rolling statistics (called inside save_days' transaction) ---
+
+    def _embedding(self, ordinal: int) -> Optional[np.ndarray]:
+        row = self.conn.execute(
+            "SELECT embedding, dim FROM days WHERE day = ?", (ordinal,)
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return _from_blob(row[0], (row[1],)).astype(np.float64)
+
+    def _embeddings(self, first: int, last: int) -> list[np.ndarray]:
+        """
+        Stored embeddings for day ordinals in [first, last], reading
+        only the embedding column.
+        """
+        rows = self.conn.execute(
+            "SELECT embedding, dim FROM days "
+            "WHERE day BETWEEN ? AND ? AND embedding IS NOT NULL",
+            (first, last)
+        )
+        return [_from_blob(blob, (dim,)) for blob, dim in rows]
+
+    def _window_sum(
+        self, length: int, anchor: int, dim: int
+    ) -> tuple[np.ndarray, int]:
+        embeddings = self._embeddings(anchor - length + 1, anchor)
+        if not embeddings:
+            return np.zeros(dim), 0
+        return np.sum(embeddings, axis=0, dtype=np.float64), len(embeddings)
+
+    def _write_window(self, length: int, anchor: int, total, count: int):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO window_sums (length, anchor, total, count) "
+            "VALUES (?, ?, ?, ?)",
+            (length, anchor, np.asarray(total, dtype=np.float64).tobytes(), count)
+        )
+
+    def _reanchor_windows(self):
+        """
+        Recompute every window from the stored days, anchored at the
+        latest day that has an embedding.
+        """
+        self.conn.execute("DELETE FROM window_sums")
+        row = self.conn.execute(
+            "SELECT MAX(day), dim FROM days WHERE embedding IS NOT NULL"
+        ).fetchone()
+        if row[0] is None:
+            return
+        anchor, dim = row
+        for length in ROLLING_WINDOWS:
+            self._write_window(length, anchor, *self._window_sum(length, anchor, dim))
+
+    def _fold_windows(
+        self, ordinal: int, vector: np.ndarray, previous: Optional[np.ndarray]
+    ):
+        rows = self.conn.execute(
+            "SELECT length, anchor, total, count FROM window_sums"
+        ).fetchall()
+        if {r[0] for r in rows} != set(ROLLING_WINDOWS) or any(
+            len(_sum_blob(r[2])) != len(vector) for r in rows
+        ):
+            self._reanchor_windows()
+            return
+
+        for length, anchor, total, count in rows:
+            total = _sum_blob(total)
+            if ordinal == anchor + 1 and previous is None:
+                # Slide the window forward by one day
+                total += vector
+                count += 1
+                dropped = self._embedding(ordinal - length)
+                if dropped is not None:
+                    total -= dropped
+                    count -= 1
+                anchor = ordinal
+            elif ordinal > anchor:
+                # A gap since the anchor: re-anchor from the stored days
+                anchor = ordinal
+                total, count = self._window_sum(length, anchor, len(vector))
+            elif ordinal > anchor - length:
+                # An earlier day inside the window was added or re-run
+                total += vector if previous is None else vector - previous
+                count += previous is None
+            else:
+                continue
+            self._write_window(length, anchor, total, count)
+
+    def _fold_ema(
+        self, ordinal: int, vector: np.ndarray, previous: Optional[np.ndarray]
+    ):
+        """
+        The EMA follows days in the order they are saved; re-saving the
+        latest day replaces its contribution instead of compounding it.
+        Days before the latest are not folded in.
+        """
+        row = self.conn.execute(
+            "SELECT anchor, value, previous FROM ema WHERE id = 0"
+        ).fetchone()
+        if row is None or len(_sum_blob(row[1])) != len(vector):
+            anchor, value, before = ordinal, vector, vector
+        else:
+            anchor, value, before = row[0], _sum_blob(row[1]), _sum_blob(row[2])
+            if ordinal > anchor:
+                anchor, before = ordinal, value
+            elif ordinal < anchor or previous is None:
+                return
+            value = EMA_ALPHA * vector + (1 - EMA_ALPHA) * before
+        self.conn.execute(
+            "INSERT OR REPLACE INTO ema (id, anchor, value, previous) "
+            "VALUES (0, ?, ?, ?)",
+            (anchor, value.tobytes(), before.tobytes())
+        )
+
+    def load_day(self, day: date = None) -> Optional[DayState]:
+        """
+        Load the state stored for day. Defaults to today.
+        """
+        day = day or date.today()
+        row = self.conn.execute(
+            f"SELECT {_COLUMNS} FROM days WHERE day = ?", (day.toordinal(),)
+        ).fetchone()
+        return _state(row) if row else None
+
+    def load_latest(self, before: date = None) -> Optional[DayState]:
+        """
+        Most recent stored day, optionally strictly before a given day.
+        """
+        bound = before.toordinal() if before else date.max.toordinal() + 1
+        row = self.conn.execute(
+            f"SELECT {_COLUMNS} FROM days WHERE day < ? "
+            "ORDER BY day DESC LIMIT 1",
+            (bound,)
+        ).fetchone()
+        return _state(row) if row else None
+
+    def load_range(self, start: date, end: date) -> list[DayState]:
+        """
+        Every stored day in [start, end], oldest first.
+        """
+        rows = self.conn.execute(
+            f"SELECT {_COLUMNS} FROM days WHERE day BETWEEN ? AND ? ORDER BY day",
+            (start.toordinal(), end.toordinal())
+        ).fetchall()
+        return [_state(r) for r in rows]
+
+    def day_span(self) -> tuple[int, Optional[date], Optional[date]]:
+        """
+        Number of stored days and the first and last of them.
+        """
+        count, first, last = self.conn.execute(
+            "SELECT COUNT(*), MIN(day), MAX(day) FROM days"
+        ).fetchone()
+        if not count:
+            return 0, None, None
+        return count, date.fromordinal(first), date.fromordinal(last)
+
+    def rolling_anchor(self) -> Optional[date]:
+        """
+        The last day the running window sums cover, if any.
+        """
+        row = self.conn.execute("SELECT MAX(anchor) FROM window_sums").fetchone()
+        return date.fromordinal(row[0]) if row[0] is not None else None
+
+    def rolling_average(self, day: date, n: int = 14) -> Optional[np.ndarray]:
+        """
+        Mean embedding of the n days before day, as a (1, dim) array,
+        or None if none of them are stored. Windows listed in
+        ROLLING_WINDOWS are answered from the running sums when they are
+        anchored at the day before; anything else reads the window's
+        embeddings.
+        """
+        ordinal = day.toordinal() - 1
+        row = self.conn.execute(
+            "SELECT anchor, total, count FROM window_sums WHERE length = ?", (n,)
+        ).fetchone()
+        if row is not None and row[0] == ordinal:
+            if row[2] == 0:
+                return None
+            return (_sum_blob(row[1]) / row[2])[None, :]
+
+        embeddings = self._embeddings(ordinal - n + 1, ordinal)
+        if not embeddings:
+            return None
+        return np.mean(embeddings, axis=0, keepdims=True)
+
+    def rolling_ema(self) -> Optional[np.ndarray]:
+        """
+        Exponential moving average of the saved days, as a (1, dim) array,
+        or None if nothing has been saved.
+        """
+        row = self.conn.execute("SELECT value FROM ema WHERE id = 0").fetchone()
+        return _sum_blob(row[0])[None, :] if row is not None else None
+
+
+def _legacy_embeddings() -> dict[date, np.ndarray]:
+    """
+    Daily embeddings from the pre-store layouts: one YYYY-MM-DD.npy per
+    day and the memory-mapped history matrix. The matrix wins where both
+    hold a day, since it was written later.
+    """
+    found = {}
+    for path in LEGACY_EMBEDDINGS_DIR.glob("*.npy"):
+        try:
+            found[date.fromisoformat(path.stem)] = np.load(path).reshape(-1)
+        except ValueError:
+            continue  # latest.npy and anything else that isn't a day
+
+    index_path = LEGACY_EMBEDDINGS_DIR / "index.json"
+    if index_path.exists():
+        index = json.loads(index_path.read_text())
+        if index["days"]:
+            matrix = np.fromfile(
+                LEGACY_EMBEDDINGS_DIR / "history.f32", dtype=VECTOR_DTYPE
+            )
+            rows = matrix[: len(index["days"]) * index["dim"]]
+            for ordinal, vector in zip(index["days"], rows.reshape(-1, index["dim"])):
+                found[date.fromordinal(ordinal)] = vector
+    return found
+
+
+def migrate_legacy_state(store: StateStore) -> int:
+    """
+    Import the per-day embedding, velocity, emotion and centroid files
+    into store in one transaction. The files are left in place.
+    Returns the number of days imported.
+    """
+    def file_days(base_dir: Path, suffix: str) -> list[date]:
+        found = []
+        for path in base_dir.glob(f"*{suffix}"):
+            try:
+                found.append(date.fromisoformat(path.stem))
+            except ValueError:
+                continue  # latest.* and anything else that isn't a day
+        return found
+
+    embeddings = _legacy_embeddings()
+    days = set(embeddings)
+    days.update(file_days(velocity_files.BASE_DIR, ".txt"))
+    days.update(file_days(emotion_files.BASE_DIR, ".json"))
+    days.update(file_days(LEGACY_TOPICS_DIR, ".npy"))
+
+    def load_centroids(day: date) -> Optional[np.ndarray]:
+        path = LEGACY_TOPICS_DIR / f"{day.isoformat()}.npy"
+        return np.load(path) if path.exists() else None
+
+    store.save_days([
+        DayState(
+            day=day,
+            embedding=embeddings.get(day),
+            velocity=velocity_files.load_velocity(day),
+            emotion=emotion_files.load_emotion(day),
+            centroids=load_centroids(day),
+        )
+        for day in sorted(days)
+    ])
+    return len(days)
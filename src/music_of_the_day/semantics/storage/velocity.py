@@ -2,7 +2,6 @@ from pathlib import Path
 from datetime import date, timedelta
 
 BASE_DIR = Path("data/processed/velocities")
-BASE_DIR.mkdir(parents=True, exist_ok=True)
 
 
 def save_velocity(velocity: float, day: date = None) -> Path:
@@ -11,6 +10,7 @@ def save_velocity(velocity: float, day: date = None) -> Path:
     Also updates 'latest.txt' for convenience.
     """
     day = day or date.today()
+    BASE_DIR.mkdir(parents=True, exist_ok=True)
     path = BASE_DIR / f"{day.isoformat()}.txt"
     path.write_text(f"{velocity:.6f}")  # save float with precision
 
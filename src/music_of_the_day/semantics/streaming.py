@@ -0,0 +1,66 @@
+from typing import Optional
+
+import numpy as np
+
+
+class DailyAccumulator:
+    """
+    Builds a day's aggregates from embedding batches as they arrive.
+
+    Keeps a running sum for the daily mean embedding and a fixed-size
+    uniform reservoir sample of articles as clustering input, so memory
+    stays bounded however many articles are streamed through.
+    """
+
+    def __init__(self, sample_size: int = 2048, seed: int = 42):
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(seed)
+        self.count = 0
+        self._sum: Optional[np.ndarray] = None
+        self._sample: Optional[np.ndarray] = None
+        self._filled = 0
+
+    def update(self, embeddings: np.ndarray):
+        embeddings = np.atleast_2d(embeddings)
+        n = len(embeddings)
+        if n == 0:
+            return
+
+        if self._sum is None:
+            dim = embeddings.shape[1]
+            self._sum = np.zeros(dim, dtype=np.float64)
+            self._sample = np.empty((self.sample_size, dim), dtype=embeddings.dtype)
+        self._sum += embeddings.sum(axis=0, dtype=np.float64)
+
+        # --- Fill the reservoir first ---
+        take = min(n, self.sample_size - self._filled)
+        if take:
+            self._sample[self._filled:self._filled + take] = embeddings[:take]
+            self._filled += take
+
+        # --- Then replace with probability sample_size / seen (Algorithm R) ---
+        rest = n - take
+        if rest:
+            seen = self.count + take + np.arange(1, rest + 1)
+            slots = self.rng.integers(0, seen)
+            for row, slot in zip(embeddings[take:], slots):
+                if slot < self.sample_size:
+                    self._sample[slot] = row
+
+        self.count += n
+
+    @property
+    def mean(self) -> Optional[np.ndarray]:
+        if self.count == 0:
+            return None
+        return self._sum / self.count
+
+    @property
+    def sample(self) -> np.ndarray:
+        """
+        Every article when fewer than sample_size were seen, else a
+        uniform random subset of sample_size of them.
+        """
+        if self._sample is None:
+            return np.zeros((0, 0))
+        return self._sample[:self._filled]
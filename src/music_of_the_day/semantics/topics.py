@@ -0,0 +1,105 @@
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from music_of_the_day.instrumentation import instrumented
+
+
+@dataclass
+class TopicResult:
+    labels: np.ndarray            # shape (N,) cluster index per article
+    centroids: np.ndarray         # shape (k, D)
+    continuity: Optional[float]   # share of today's articles in a continued topic
+    matches: list[tuple[int, int, float]] = field(default_factory=list)
+    # (today's cluster, yesterday's cluster, cosine similarity)
+
+
+def _unit(x: np.ndarray) -> np.ndarray:
+    return x / (np.linalg.norm(x, axis=1, keepdims=True) + 1e-12)
+
+
+class TopicEngine:
+    """
+    Daily topic clustering that carries its centroids from day to day.
+
+    With yesterday's centroids available, k-means is warm-started from
+    them with a single initialisation instead of ten cold restarts;
+    corpora above minibatch_threshold use mini-batch updates. Each fit
+    also reports which of today's topics continue yesterday's.
+    """
+
+    def __init__(
+        self,
+        k: int = 4,
+        previous_centroids: Optional[np.ndarray] = None,
+        minibatch_threshold: int = 5000,
+        match_threshold: float = 0.8,
+        random_state: int = 42
+    ):
+        self.k = k
+        self.previous_centroids = previous_centroids
+        self.minibatch_threshold = minibatch_threshold
+        self.match_threshold = match_threshold
+        self.random_state = random_state
+
+    def _model(self, n: int, k: int, dim: int):
+        from sklearn.cluster import KMeans, MiniBatchKMeans
+
+        prev = self.previous_centroids
+        warm = prev is not None and prev.shape == (k, dim)
+        init = prev if warm else "k-means++"
+        n_init = 1 if warm else 10
+
+        if n > self.minibatch_threshold:
+            return MiniBatchKMeans(
+                n_clusters=k,
+                init=init,
+                n_init=n_init if warm else 3,
+                batch_size=1024,
+                random_state=self.random_state
+            )
+        return KMeans(
+            n_clusters=k, init=init, n_init=n_init, random_state=self.random_state
+        )
+
+    def match(self, centroids: np.ndarray) -> list[tuple[int, int, float]]:
+        """
+        One-to-one matching of today's centroids to yesterday's by cosine
+        similarity; pairs below match_threshold are dropped.
+        """
+        prev = self.previous_centroids
+        if prev is None or prev.shape[1] != centroids.shape[1]:
+            return []
+        from scipy.optimize import linear_sum_assignment
+
+        similarity = _unit(centroids) @ _unit(prev).T
+        rows, cols = linear_sum_assignment(-similarity)
+        return [
+            (int(r), int(c), float(similarity[r, c]))
+            for r, c in zip(rows, cols)
+            if similarity[r, c] >= self.match_threshold
+        ]
+
+    @instrumented("topics", items=lambda result: len(result.labels))
+    def fit(self, embeddings: np.ndarray) -> TopicResult:
+        k = min(self.k, max(1, len(embeddings)))
+        model = self._model(len(embeddings), k, embeddings.shape[1])
+        labels = model.fit_predict(embeddings)
+        centroids = np.asarray(model.cluster_centers_)
+
+        matches = self.match(centroids)
+        continuity = None
+        if self.previous_centroids is not None:
+            counts = np.bincount(labels, minlength=k)
+            continued = [today for today, _, _ in matches]
+            continuity = float(counts[continued].sum() / counts.sum())
+
+        # Today's topics seed tomorrow's fit
+        self.previous_centroids = centroids
+        return TopicResult(
+            labels=labels,
+            centroids=centroids,
+            continuity=continuity,
+            matches=matches
+        )
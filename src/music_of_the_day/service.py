@@ -0,0 +1,259 @@
+import json
+import os
+import signal
+import sys
+import uuid
+from datetime import date
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
+from pathlib import Path
+
+DEFAULT_PORT = 8765
+
+
+class GenerationService:
+    """
+    Generates pieces on demand, for a list of articles or an archived date.
+
+    preload() loads the embedding model, the article index and the
+    SoundFont once; in the pre-forked server this happens in the parent,
+    so every worker shares those pages copy-on-write. Requests never
+    write the daily state: continuity is read from the state store, the
+    article index is only searched, and every request renders into its
+    own directory under out_root/requests. Days added to the index after
+    preload() are seen after a restart.
+    """
+
+    def __init__(
+        self,
+        out_root: str | Path = "outputs",
+        soundfont_path: str | None = None,
+        quality: str = "full",
+        model_name: str = "all-mpnet-base-v2"
+    ):
+        from music_of_the_day.pipeline import DEFAULT_SOUNDFONT
+
+        self.out_root = Path(out_root)
+        self.soundfont_path = soundfont_path or DEFAULT_SOUNDFONT
+        self.quality = quality
+        self.model_name = model_name
+        self.embedder = None
+        self.article_index = None
+
+    def preload(self):
+        from music_of_the_day.music.render import preload_soundfont
+        from music_of_the_day.semantics.embed import EmbeddingEngine
+        from music_of_the_day.semantics.storage.article_index import ArticleIndex
+
+        self.embedder = EmbeddingEngine(model_name=self.model_name)
+        self.article_index = ArticleIndex()
+        if self.quality == "full":
+            preload_soundfont(self.soundfont_path)
+
+    def generate(
+        self, articles: list[str] | None = None, day: date | None = None
+    ) -> dict:
+        """
+        Run the pipeline and render. With articles, they are treated as a
+        custom day; with only a date, that day is recomputed from the
+        article archive. Returns the features, intent and output paths.
+        """
+        from music_of_the_day.ingestion.dedup import deduplicate
+        from music_of_the_day.ingestion.normalize import normalize_text
+        from music_of_the_day.music.render_cache import RenderCache
+        from music_of_the_day.pipeline import render_outputs, run_pipeline
+        from music_of_the_day.semantics.storage.articles import load_articles
+        from music_of_the_day.semantics.storage.state import DayState, StateStore
+        from music_of_the_day.semantics.topics import TopicEngine
+
+        if self.embedder is None:
+            self.preload()
+
+        day = day or date.today()
+        embeddings = None
+        if articles:
+            articles = deduplicate([normalize_text(a) for a in articles])
+        else:
+            archived = load_articles(day)
+            if archived is None:
+                raise LookupError(f"No archived articles for {day.isoformat()}")
+            articles, embeddings = [], archived.embeddings
+        # Never outputs/<date>: that directory belongs to the daily run
+        request_id = f"{day.isoformat()}-{uuid.uuid4().hex[:8]}"
+        out_dir = self.out_root / "requests" / request_id
+
+        # One connection per request: SQLite handles must not cross a fork
+        with StateStore() as store:
+            previous = store.load_latest(before=day) or DayState(day=day)
+            rolling_embeddings = store.rolling_average(day, n=14)
+
+        features, intent, _ = run_pipeline(
+            articles=articles,
+            rolling_embeddings=rolling_embeddings,
+            embedding_yesterday=previous.embedding,
+            velocity_yesterday=previous.velocity,
+            emotion_yesterday=previous.emotion,
+            embedder=self.embedder,
+            topic_engine=TopicEngine(previous_centroids=previous.centroids),
+            article_index=self.article_index,
+            update_index=False,
+            day=day,
+            embeddings=embeddings
+        )
+        paths = render_outputs(
+            features,
+            intent,
+            out_dir,
+            self.soundfont_path,
+            quality=self.quality,
+            cache=RenderCache()
+        )
+
+        result = json.loads(paths["features"].read_text())
+        result["day"] = day.isoformat()
+        result["paths"] = {name: str(path) for name, path in paths.items()}
+        return result
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    GET /health and POST /generate with a JSON body of
+    {"articles": [...]} and/or {"date": "YYYY-MM-DD"}.
+    """
+
+    def _reply(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._reply(404, {"error": f"Unknown path {self.path}"})
+            return
+        self._reply(200, {"status": "ok", "pid": os.getpid()})
+
+    def do_POST(self):
+        if self.path != "/generate":
+            self._reply(404, {"error": f"Unknown path {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            articles = request.get("articles")
+            day = date.fromisoformat(request["date"]) if request.get("date") else None
+            if articles is not None and not (
+                isinstance(articles, list) and all(isinstance(a, str) for a in articles)
+            ):
+                raise ValueError("'articles' must be a list of strings")
+            if not articles and day is None:
+                raise ValueError("Provide 'articles' or 'date'")
+        except (ValueError, AttributeError) as e:
+            self._reply(400, {"error": str(e)})
+            return
+
+        try:
+            result = self.server.service.generate(articles=articles, day=day)
+        except LookupError as e:
+            self._reply(404, {"error": str(e)})
+        except Exception as e:
+            self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+        else:
+            self._reply(200, result)
+
+    def log_message(self, format, *args):
+        print(f"- [{os.getpid()}] {self.address_string()} {format % args}")
+
+
+def make_server(
+    service,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    threaded: bool = False
+):
+    server_cls = ThreadingHTTPServer if threaded else HTTPServer
+    server = server_cls((host, port), _Handler)
+    server.service = service
+    return server
+
+
+def serve(
+    service: GenerationService,
+    host: str = "127.0.0.1",
+    port: int = DEFAULT_PORT,
+    workers: int = 1
+):
+    """
+    Preload the service, then serve it. With workers > 1 on platforms
+    with fork, the listening socket and the preloaded model are shared by
+    that many forked worker processes, each handling one request at a
+    time; workers that die are replaced, and SIGTERM or SIGINT stops
+    them all. Each worker caps torch at its share of the CPUs, so the
+    workers do not oversubscribe the machine. Elsewhere (Windows) a
+    single threaded server is used.
+    """
+    service.preload()
+
+    if workers <= 1 or not hasattr(os, "fork"):
+        server = make_server(service, host, port, threaded=True)
+        url = f"http://{host}:{server.server_port}"
+        print(f"- Serving on {url} (single process)", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+        return
+
+    server = make_server(service, host, port)
+    url = f"http://{host}:{server.server_port}"
+    print(f"- Serving on {url} with {workers} workers", flush=True)
+    children: set[int] = set()
+    stopping = False
+    threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+
+    def spawn():
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            torch = sys.modules.get("torch")  # only if the model pulled it in
+            if torch is not None:
+                torch.set_num_threads(threads_per_worker)
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)
+        children.add(pid)
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    for _ in range(workers):
+        spawn()
+
+    while children:
+        try:
+            pid, _ = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        children.discard(pid)
+        if not stopping:
+            print(f"⚠️ Worker {pid} exited, starting a replacement", flush=True)
+            spawn()
+
+    server.server_close()
@@ -0,0 +1,41 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+from music_of_the_day.semantics import models
+
+
+class StubModel:
+    """
+    Offline stand-in for a SentenceTransformer: a deterministic unit
+    vector per text, and a record of every text it was asked to encode.
+    """
+
+    def __init__(self, dim: int = 16):
+        self.dim = dim
+        self.encoded: list[str] = []
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dim
+
+    def encode(self, texts, show_progress_bar=False, normalize_embeddings=True):
+        self.encoded.extend(texts)
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.md5(text.encode()).digest()[:8], "little")
+            out[i] = np.random.default_rng(seed).normal(size=self.dim)
+        if normalize_embeddings:
+            out /= np.linalg.norm(out, axis=1, keepdims=True)
+        return out
+
+
+@pytest.fixture
+def stub_model():
+    """
+    A StubModel served by get_model("stub").
+    """
+    model = StubModel()
+    models.register_model("stub", model)
+    yield model
+    models.unload_model("stub")
@@ -0,0 +1,131 @@
+import json
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from music_of_the_day.backfill import (
+    ArchiveArticleSource,
+    BackfillState,
+    render_days,
+    run_backfill,
+)
+from music_of_the_day.mapping.semantics_to_intent import build_intent
+from music_of_the_day.semantics.embed import EmbeddingEngine
+from music_of_the_day.semantics.features import extract_semantic_features
+from music_of_the_day.semantics.storage.state import StateStore
+
+DAYS = [date(2024, 1, 1) + timedelta(days=i) for i in range(3)]
+
+
+@pytest.fixture
+def archive_dir(tmp_path):
+    """
+    Three days of distinct synthetic articles: a .json, a .txt and a
+    .json day, with nothing archived for the day after.
+    """
+    rng = np.random.default_rng(0)
+    words = [f"word{i}" for i in range(200)]
+    archive = tmp_path / "archive"
+    archive.mkdir()
+    for i, day in enumerate(DAYS):
+        articles = [" ".join(rng.choice(words, size=15)) for _ in range(12)]
+        if i == 1:
+            path = archive / f"{day.isoformat()}.txt"
+            path.write_text("\n".join(articles) + "\n\n", encoding="utf-8")
+        else:
+            path = archive / f"{day.isoformat()}.json"
+            path.write_text(json.dumps(articles), encoding="utf-8")
+    return archive
+
+
+def test_archive_source_reads_json_and_txt(archive_dir):
+    source = ArchiveArticleSource(archive_dir)
+    assert [len(source(day)) for day in DAYS] == [12, 12, 12]
+    assert source(DAYS[-1] + timedelta(days=1)) == []
+
+
+def test_backfill_resumes_from_stored_state(
+    tmp_path, archive_dir, monkeypatch, stub_model
+):
+    source = ArchiveArticleSource(archive_dir)
+    end = DAYS[-1] + timedelta(days=1)  # no articles: skipped
+
+    def backfill(start, stop, store):
+        return run_backfill(
+            start, stop, source,
+            render=False, embedder=EmbeddingEngine("stub"), store=store
+        )
+
+    # --- One pass over all three days ---
+    (tmp_path / "full").mkdir()
+    monkeypatch.chdir(tmp_path / "full")
+    with StateStore() as store:
+        days = backfill(DAYS[0], end, store)
+        full = store.load_day(DAYS[-1])
+    assert days == DAYS
+
+    # --- Two days, then a separate run resuming from the stored state ---
+    (tmp_path / "resumed").mkdir()
+    monkeypatch.chdir(tmp_path / "resumed")
+    with StateStore() as store:
+        backfill(DAYS[0], DAYS[1], store)
+        state = BackfillState.from_storage(DAYS[2], store=store)
+        assert [day for day, _ in state.history] == DAYS[:2]
+        np.testing.assert_allclose(
+            state.embedding_yesterday, store.load_day(DAYS[1]).embedding
+        )
+
+        assert backfill(DAYS[2], end, store) == DAYS[2:]
+        resumed = store.load_day(DAYS[-1])
+
+    np.testing.assert_allclose(resumed.embedding, full.embedding, rtol=1e-6)
+    assert resumed.velocity == pytest.approx(full.velocity)
+    assert resumed.emotion == full.emotion
+    np.testing.assert_allclose(resumed.centroids, full.centroids, rtol=1e-6)
+
+
+def test_render_days_in_a_process_pool(tmp_path, capsys):
+    days = []
+    for day in DAYS[:2]:
+        embeddings = np.random.default_rng(day.toordinal()).random((20, 16))
+        features = extract_semantic_features(embeddings, embeddings.mean(axis=0))
+        days.append((day, features, build_intent(features, duration_seconds=2)))
+
+    rendered = render_days(days, out_root=tmp_path, workers=2, quality="preview")
+
+    assert rendered == DAYS[:2]
+    for day in DAYS[:2]:
+        out_dir = tmp_path / day.isoformat()
+        for name in ("music.mid", "music.wav", "explanation.txt", "features.json"):
+            assert (out_dir / name).stat().st_size > 0
+    out = capsys.readouterr().out
+    assert "[1/2] rendered" in out and "[2/2] rendered" in out
+
+
+def test_archive_only_backfill_skips_the_model(
+    tmp_path, archive_dir, monkeypatch, stub_model
+):
+    from music_of_the_day import backfill
+
+    monkeypatch.chdir(tmp_path)
+    with StateStore() as store:
+        run_backfill(
+            DAYS[0], DAYS[-1], ArchiveArticleSource(archive_dir),
+            render=False, embedder=EmbeddingEngine("stub"), store=store
+        )
+        first = store.load_day(DAYS[-1])
+
+    def no_model(*args, **kwargs):
+        raise AssertionError("the embedding model was loaded")
+
+    monkeypatch.setattr(backfill, "EmbeddingEngine", no_model)
+    with StateStore() as store:
+        days = run_backfill(
+            DAYS[0], DAYS[-1], lambda day: [], render=False, store=store
+        )
+        assert days == DAYS
+        recomputed = store.load_day(DAYS[-1])
+
+    # int8 archive round trip
+    np.testing.assert_allclose(recomputed.embedding, first.embedding, atol=1e-2)
@@ -0,0 +1,60 @@
+import os
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+import music_of_the_day
+from music_of_the_day import cli
+from music_of_the_day.explain.explanation import generate_explanation
+from music_of_the_day.explain.snapshot import read_features_json, write_features_json
+from music_of_the_day.mapping.semantics_to_intent import build_intent
+from music_of_the_day.semantics.features import extract_semantic_features
+
+
+def test_import_is_cheap_and_side_effect_free(tmp_path):
+    code = (
+        "import sys\n"
+        "import music_of_the_day.cli, music_of_the_day.pipeline\n"
+        "import music_of_the_day.backfill, music_of_the_day.semantics.storage.state\n"
+        "heavy = {'sentence_transformers', 'torch', 'sklearn',\n"
+        "         'pretty_midi', 'fluidsynth'}\n"
+        "print(sorted(heavy & set(sys.modules)))\n"
+    )
+    src = str(Path(music_of_the_day.__file__).parents[1])
+    pythonpath = os.pathsep.join([src, os.environ.get("PYTHONPATH", "")])
+    env = {**os.environ, "PYTHONPATH": pythonpath}
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    assert result.stdout.strip() == "[]", result.stderr
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_explain_regenerates_from_features_json(tmp_path, capsys):
+    embeddings = np.random.rand(20, 16)
+    features = extract_semantic_features(embeddings, embeddings.mean(axis=0))
+    intent = build_intent(features)
+
+    day = date(2024, 4, 1)
+    out_dir = tmp_path / day.isoformat()
+    out_dir.mkdir()
+    write_features_json(features, intent, out_dir / "features.json")
+
+    restored_features, restored_intent = read_features_json(out_dir / "features.json")
+    assert restored_features == features
+    np.testing.assert_allclose(restored_intent.intensity_curve, intent.intensity_curve)
+
+    argv = ["explain", day.isoformat(), "--outputs", str(tmp_path), "--write"]
+    assert cli.main(argv) == 0
+    expected = generate_explanation(features, intent)
+    assert (out_dir / "explanation.txt").read_text() == expected
+    assert expected in capsys.readouterr().out
+
+    assert cli.main(["explain", "2024-04-02", "--outputs", str(tmp_path)]) == 1
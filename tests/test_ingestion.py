@@ -2,6 +2,16 @@ import pytest
 from music_of_the_day.ingestion.fetch_news import fetch_news
 import types
 
+
+def _response(content: bytes, status_code: int = 200):
+    return types.SimpleNamespace(
+        status_code=status_code,
+        content=content,
+        headers={},
+        raise_for_status=lambda: None
+    )
+
+
 def test_fetch_news_rss(monkeypatch):
     # --- Step 1: mock config ---
     dummy_config = {
@@ -10,7 +20,7 @@ def test_fetch_news_rss(monkeypatch):
     }
     monkeypatch.setattr("music_of_the_day.ingestion.fetch_news.load_config", lambda: dummy_config)
 
-    # --- Step 2: mock feedparser.parse ---
+    # --- Step 2: mock the download and feedparser.parse ---
     class DummyEntry:
         title = "Test title"
         summary = "Test summary"
@@ -19,7 +29,9 @@ def test_fetch_news_rss(monkeypatch):
         entries = [DummyEntry()]
 
     import feedparser
-    monkeypatch.setattr(feedparser, "parse", lambda url: DummyFeed())
+    import requests
+    monkeypatch.setattr(requests, "get", lambda url, **kw: _response(url.encode()))
+    monkeypatch.setattr(feedparser, "parse", lambda data: DummyFeed())
 
     # --- Step 3: call fetch_news ---
     articles = fetch_news(api_key=None, limit=1)
@@ -28,3 +40,129 @@ def test_fetch_news_rss(monkeypatch):
     assert len(articles) == 1
     assert "Test title" in articles[0]
     assert "Test summary" in articles[0]
+
+
+def test_fetch_news_concurrent_keeps_priority_and_skips_slow_feeds(monkeypatch):
+    import threading
+    import time
+
+    dummy_config = {
+        "news_api": {"api_key": None, "query": "world", "limit": 10},
+        "rss_feeds": [
+            "http://hung1.feed/", "http://hung2.feed/", "http://a.feed/", "http://b.feed/"
+        ],
+        "ingestion": {"concurrent": True, "feed_timeout": 0.3, "deadline": 5},
+    }
+    monkeypatch.setattr(
+        "music_of_the_day.ingestion.fetch_news.load_config", lambda: dummy_config
+    )
+
+    release = threading.Event()
+    b_done = threading.Event()
+
+    def fake_get(url, **kw):
+        if "hung" in url:
+            release.wait()
+        if "a.feed" in url:
+            b_done.wait()  # finishes after b, but must still come first
+        if "b.feed" in url:
+            b_done.set()
+        return _response(url.encode())
+
+    def fake_parse(data):
+        entry = types.SimpleNamespace(title=data.decode(), summary="")
+        return types.SimpleNamespace(entries=[entry])
+
+    import feedparser
+    import requests
+    monkeypatch.setattr(requests, "get", fake_get)
+    monkeypatch.setattr(feedparser, "parse", fake_parse)
+
+    started = time.monotonic()
+    try:
+        articles = fetch_news(api_key=None, limit=10)
+    finally:
+        release.set()
+
+    # Both hung feeds started together, so both time out 0.3 s in, not 0.6 s
+    assert time.monotonic() - started < 0.5
+    assert articles == ["http://a.feed/", "http://b.feed/"]
+
+
+def test_feed_cache_uses_conditional_requests(tmp_path):
+    import threading
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    from music_of_the_day.ingestion.feed_cache import FeedCache, parse_feed
+
+    rss = (
+        b'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>'
+        b"<item><title>Cached story</title><description>Body</description></item>"
+        b"</channel></rss>"
+    )
+    statuses = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.headers.get("If-None-Match") == '"v1"':
+                statuses.append(304)
+                self.send_response(304)
+                self.end_headers()
+                return
+            statuses.append(200)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml")
+            self.send_header("ETag", '"v1"')
+            self.end_headers()
+            self.wfile.write(rss)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/rss.xml"
+
+    try:
+        cache = FeedCache(str(tmp_path))
+        first = parse_feed(url, cache)
+        second = parse_feed(url, cache)
+    finally:
+        server.shutdown()
+
+    assert statuses == [200, 304]
+    assert first == second
+    assert first[0]["title"] == "Cached story"
+
+
+def test_parse_feed_times_out_on_a_silent_server():
+    import socket
+
+    import requests
+
+    from music_of_the_day.ingestion.feed_cache import parse_feed
+
+    # Accepts connections (via the backlog) but never answers
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        url = f"http://127.0.0.1:{server.getsockname()[1]}/rss.xml"
+        with pytest.raises(requests.Timeout):
+            parse_feed(url, timeout=0.2)
+
+
+def test_deduplicate_drops_near_duplicate_stories():
+    from music_of_the_day.ingestion.dedup import deduplicate
+
+    story = (
+        "Leaders gather in Geneva for emergency climate talks as record heat "
+        "waves sweep across southern Europe and wildfires force evacuations"
+    )
+    articles = [
+        story,
+        story.replace("Leaders", "World leaders") + ".",
+        "Central bank holds interest rates steady amid signs of cooling inflation",
+        story,
+    ]
+
+    assert deduplicate(articles) == [articles[0], articles[2]]
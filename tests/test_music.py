@@ -114,3 +114,217 @@ def test_harmonic_colors_render(tmp_path, harmonic_color):
 
     midi = pretty_midi.PrettyMIDI(str(output_path))
     assert sum(len(i.notes) for i in midi.instruments) > 0
+
+
+def test_seeded_ensemble_is_reproducible(tmp_path):
+    """
+    The same seed must give the same notes; renderers draw from seeded
+    generators instead of the global NumPy state.
+    """
+    intent = make_intent(duration_seconds=20)
+    paths = [tmp_path / "a.mid", tmp_path / "b.mid"]
+    for path in paths:
+        np.random.seed(None)
+        render_ensemble(intent, str(path), seed=7)
+
+    notes = [
+        [
+            (n.pitch, n.velocity, round(n.start, 4))
+            for inst in pretty_midi.PrettyMIDI(str(p)).instruments
+            for n in inst.notes
+        ]
+        for p in paths
+    ]
+    assert notes[0] == notes[1]
+    assert len(notes[0]) > 0
+
+
+def test_direct_midi_writer_roundtrips_through_pretty_midi(tmp_path):
+    from music_of_the_day.music.events import NoteTrack, assign_channels, make_notes
+    from music_of_the_day.music.midi_writer import write_midi
+
+    starts = np.array([0.0, 0.5, 0.5, 90.0])  # last onset needs a 3-byte delta
+    lead = NoteTrack(name="Lead", program=48)
+    pitches = np.array([60, 64, 67, 72])
+    lead.extend(make_notes(pitches, np.full(4, 90), starts, starts + 0.5))
+    drums = NoteTrack(name="Drums", program=0, is_drum=True)
+    # The second hit is shorter than one tick (~1 ms) and must still sound
+    drums.extend(make_notes(
+        np.array([36, 38]),
+        np.array([100, 100]),
+        np.array([1.0, 2.0]),
+        np.array([1.25, 2.0002])
+    ))
+
+    path = write_midi(assign_channels([lead, drums]), tmp_path / "direct.mid")
+    midi = pretty_midi.PrettyMIDI(str(path))
+
+    assert [i.is_drum for i in midi.instruments] == [False, True]
+    assert midi.instruments[0].program == 48
+    read = sorted((n.pitch, n.start, n.end) for n in midi.instruments[0].notes)
+    expected = sorted(zip([60, 64, 67, 72], starts, starts + 0.5))
+    np.testing.assert_allclose(np.array(read), np.array(expected), atol=1e-3)
+
+    hits = sorted((n.pitch, n.start, n.end) for n in midi.instruments[1].notes)
+    assert [pitch for pitch, _, _ in hits] == [36, 38]
+    assert hits[1][2] > hits[1][1]
+
+
+def test_instrument_streams_do_not_depend_on_the_ensemble(tmp_path):
+    intent = make_intent(duration_seconds=20)
+
+    full = render_ensemble(intent, str(tmp_path / "full.mid"), seed=3)
+    alone = render_ensemble(
+        intent,
+        str(tmp_path / "piano.mid"),
+        seed=3,
+        instruments=["piano"],
+        max_workers=1
+    )
+
+    piano = next(t for t in full if t.name == "Piano")
+    np.testing.assert_array_equal(piano.notes, alone[0].notes)
+    assert [t.name for t in full] == ["Strings", "Bass", "Piano", "Percussion"]
+
+
+@pytest.mark.parametrize("sample_format, width", [("int16", 2), ("int24", 3)])
+def test_wav_writer_streams_integer_pcm(tmp_path, sample_format, width):
+    import wave
+
+    from music_of_the_day.music.wav import WavWriter
+
+    t = np.arange(22050) / 22050
+    tone = 0.5 * np.sin(2 * np.pi * 440 * t)
+    path = tmp_path / f"{sample_format}.wav"
+
+    with WavWriter(path, sample_rate=22050, sample_format=sample_format) as writer:
+        for start in range(0, len(tone), 4096):
+            writer.write(tone[start:start + 4096])
+
+    with wave.open(str(path), "rb") as wav:
+        assert wav.getsampwidth() == width
+        assert wav.getnframes() == len(tone)
+        raw = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.uint8)
+
+    # Sign-extend back to int32 and compare with the source signal
+    padded = np.zeros((len(tone), 4), dtype=np.uint8)
+    padded[:, 4 - width:] = raw.reshape(-1, width)
+    decoded = padded.view("<i4").ravel() / 2.0 ** 31
+    np.testing.assert_allclose(decoded, tone, atol=1e-4)
+
+
+def test_preview_synth_renders_without_fluidsynth(tmp_path):
+    import wave
+
+    from music_of_the_day.music.render import render_tracks_to_wav
+
+    intent = make_intent(duration_seconds=6)
+    tracks = render_ensemble(intent, str(tmp_path / "preview.mid"), seed=1)
+    wav_path = render_tracks_to_wav(
+        tracks, str(tmp_path / "preview.wav"), quality="preview", sample_rate=22050
+    )
+
+    with wave.open(wav_path, "rb") as wav:
+        frames = wav.getnframes()
+        audio = np.frombuffer(wav.readframes(frames), dtype="<i2")
+
+    expected = max(t.end_time for t in tracks) + 1.0
+    assert frames == int(expected * 22050)
+    assert np.abs(audio).max() > 1000
+
+
+def test_render_cache_reuses_identical_midi(tmp_path, monkeypatch):
+    from music_of_the_day.music import render as render_module
+    from music_of_the_day.music.render_cache import RenderCache
+
+    midi_path = tmp_path / "day.mid"
+    render_ensemble(make_intent(duration_seconds=4), str(midi_path), seed=5)
+    cache = RenderCache(str(tmp_path / "cache"))
+
+    calls = []
+    original = render_module.render_tracks_to_wav
+    monkeypatch.setattr(
+        render_module,
+        "render_tracks_to_wav",
+        lambda *a, **kw: calls.append(1) or original(*a, **kw)
+    )
+
+    outputs = [tmp_path / "first.wav", tmp_path / "second.wav"]
+    for wav_path in outputs:
+        render_module.render_midi_to_wav(
+            str(midi_path),
+            str(wav_path),
+            quality="preview",
+            sample_rate=8000,
+            cache=cache
+        )
+
+    assert len(calls) == 1
+    assert outputs[0].read_bytes() == outputs[1].read_bytes()
+
+    # Shrinking the budget evicts the entry
+    RenderCache(str(tmp_path / "cache"), max_bytes=0).evict()
+    assert not list((tmp_path / "cache").glob("*.wav"))
+
+
+def test_full_quality_fallback_is_cached_as_preview(tmp_path, monkeypatch):
+    import sys
+
+    from music_of_the_day.music import render as render_module
+    from music_of_the_day.music.render_cache import RenderCache
+
+    # The SoundFont exists but FluidSynth cannot be imported
+    monkeypatch.setitem(sys.modules, "fluidsynth", None)
+    soundfont = tmp_path / "test.sf2"
+    soundfont.write_bytes(b"sf2")
+    assert render_module.resolve_quality("full", str(soundfont)) == "preview"
+
+    midi_path = tmp_path / "day.mid"
+    render_ensemble(make_intent(duration_seconds=2), str(midi_path), seed=5)
+    cache = RenderCache(str(tmp_path / "cache"))
+    render_module.render_midi_to_wav(
+        str(midi_path),
+        str(tmp_path / "day.wav"),
+        soundfont_path=str(soundfont),
+        quality="full",
+        sample_rate=8000,
+        cache=cache
+    )
+
+    midi_bytes = midi_path.read_bytes()
+    keys = {
+        q: cache.key(midi_bytes, str(soundfont), 8000, "int16", q)
+        for q in ("full", "preview")
+    }
+    assert [p.stem for p in cache.cache_dir.glob("*.wav")] == [keys["preview"]]
+
+
+def test_rendering_the_same_day_twice_hits_the_cache(tmp_path, monkeypatch):
+    from music_of_the_day import pipeline
+    from music_of_the_day.mapping.semantics_to_intent import build_intent
+    from music_of_the_day.music.render_cache import RenderCache
+    from music_of_the_day.semantics.features import extract_semantic_features
+
+    embeddings = np.random.default_rng(0).random((20, 16))
+    features = extract_semantic_features(embeddings, embeddings.mean(axis=0))
+    intent = build_intent(features, duration_seconds=2)
+    cache = RenderCache(str(tmp_path / "cache"))
+
+    calls = []
+    original = pipeline.render_tracks_to_wav
+    monkeypatch.setattr(
+        pipeline,
+        "render_tracks_to_wav",
+        lambda *a, **kw: calls.append(1) or original(*a, **kw)
+    )
+
+    runs = [
+        pipeline.render_outputs(
+            features, intent, tmp_path / run, quality="preview", cache=cache
+        )
+        for run in ("first", "second")
+    ]
+
+    assert len(calls) == 1
+    assert runs[0]["midi"].read_bytes() == runs[1]["midi"].read_bytes()
+    assert runs[0]["wav"].read_bytes() == runs[1]["wav"].read_bytes()
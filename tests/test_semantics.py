@@ -21,3 +21,163 @@ def test_semantic_feature_shapes():
     assert features.narrative_phase in {
         "build_up", "climax", "aftermath", "stasis"
     }
+
+
+def test_daily_accumulator_streams_bounded_batches():
+    from music_of_the_day.semantics.streaming import DailyAccumulator
+
+    embeddings = np.random.rand(1000, 32)
+    acc = DailyAccumulator(sample_size=100)
+    for start in range(0, len(embeddings), 64):
+        acc.update(embeddings[start:start + 64])
+
+    assert acc.count == 1000
+    np.testing.assert_allclose(acc.mean, embeddings.mean(axis=0))
+    assert acc.sample.shape == (100, 32)
+    # Every sampled row is one of the streamed articles
+    assert all((embeddings == row).all(axis=1).any() for row in acc.sample)
+
+
+def test_topic_engine_warm_starts_and_reports_continuity():
+    from music_of_the_day.semantics.topics import TopicEngine
+
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(3, 32)) * 5
+
+    def day(n=60):
+        return np.vstack([c + rng.normal(size=(n // 3, 32)) * 0.1 for c in centers])
+
+    engine = TopicEngine(k=3)
+    first = engine.fit(day())
+    assert first.continuity is None
+
+    second = engine.fit(day())
+    assert second.continuity == 1.0
+    assert sorted(t for t, _, _ in second.matches) == [0, 1, 2]
+
+    # Features expose continuity when an engine with history is supplied
+    embeddings = day()
+    features = extract_semantic_features(
+        embeddings_today=embeddings,
+        daily_embedding_today=embeddings.mean(axis=0),
+        topic_engine=engine,
+        num_clusters=3
+    )
+    assert features.topic_continuity == 1.0
+
+
+def test_linear_kernels_match_pairwise_sklearn():
+    from sklearn.metrics.pairwise import cosine_distances
+
+    from music_of_the_day.semantics.kernels import compute_day_metrics
+
+    rng = np.random.default_rng(1)
+    embeddings = rng.normal(size=(200, 64))
+    daily = embeddings.mean(axis=0)
+    rolling = rng.normal(size=(14, 64))
+    yesterday = rng.normal(size=64)
+
+    metrics = compute_day_metrics(embeddings, daily, rolling, yesterday)
+
+    to_rolling = cosine_distances([daily], rolling)[0]
+    assert np.isclose(metrics.intra_day_dispersion, cosine_distances(embeddings).mean())
+    assert np.isclose(
+        metrics.semantic_shift, cosine_distances([daily], [rolling.mean(axis=0)])[0, 0]
+    )
+    assert np.isclose(metrics.semantic_novelty, np.percentile(to_rolling, 90))
+    assert np.isclose(
+        metrics.semantic_velocity, cosine_distances([daily], [yesterday])[0, 0]
+    )
+
+
+def test_instrumentation_records_feature_stages(tmp_path):
+    import json
+
+    from music_of_the_day import instrumentation
+
+    embeddings = np.random.rand(50, 32)
+    report = instrumentation.start_run("test")
+    try:
+        extract_semantic_features(embeddings, embeddings.mean(axis=0))
+        with instrumentation.span("custom") as s:
+            s.items = 3
+    finally:
+        instrumentation.stop_run()
+
+    # Spans outside a run are not recorded
+    extract_semantic_features(embeddings, embeddings.mean(axis=0))
+
+    assert list(report.stages) == ["topics", "features", "custom"]
+    assert report.stages["topics"].items == 50
+    assert report.stages["custom"].items == 3
+    assert report.stages["features"].calls == 1
+    stages = report.stages
+    assert stages["features"].wall_seconds >= stages["topics"].wall_seconds
+
+    data = json.loads(report.write_json(tmp_path / "run_report.json").read_text())
+    assert data["stages"]["custom"]["items"] == 3
+
+    prom = report.write_prometheus(tmp_path / "motd.prom").read_text()
+    assert 'music_of_the_day_stage_items{run="test",stage="topics"} 50' in prom
+
+
+def test_embedding_cache_encodes_each_article_once(tmp_path, stub_model):
+    from music_of_the_day.semantics.embed import EmbeddingEngine
+
+    engine = EmbeddingEngine(model_name="stub", cache_dir=str(tmp_path))
+    first = engine.embed(["a", "b", "a"])
+    assert stub_model.encoded == ["a", "b"]
+    np.testing.assert_array_equal(first[0], first[2])
+
+    second = engine.embed(["b", "c", "a", "c"])
+    assert stub_model.encoded == ["a", "b", "c"]
+    np.testing.assert_array_equal(second[0], first[1])
+    np.testing.assert_array_equal(second[2], first[0])
+    assert sorted(p.suffix for p in tmp_path.iterdir()) == [".npy"] * 3
+
+
+def test_engines_share_one_model_until_unloaded(tmp_path, stub_model):
+    from music_of_the_day.semantics import models
+    from music_of_the_day.semantics.embed import EmbeddingEngine
+
+    a = EmbeddingEngine(model_name="stub", cache_dir=str(tmp_path / "a"))
+    b = EmbeddingEngine(model_name="stub", cache_dir=str(tmp_path / "b"))
+    assert a.model is b.model is stub_model
+    assert ("stub", None) in models.loaded_models()
+
+    assert models.unload_model("stub") == 1
+    assert ("stub", None) not in models.loaded_models()
+    assert models.unload_model("stub") == 0
+
+
+def test_daily_run_report_names_every_stage(tmp_path, monkeypatch, stub_model):
+    import json
+
+    from music_of_the_day import daily, instrumentation
+    from music_of_the_day.semantics import models
+
+    models.register_model("all-mpnet-base-v2", stub_model)  # daily's default
+    monkeypatch.chdir(tmp_path)
+    rng = np.random.default_rng(0)
+    words = [f"word{i}" for i in range(200)]
+    articles = [" ".join(rng.choice(words, size=15)) for _ in range(12)]
+    monkeypatch.setattr(daily, "iter_news", lambda limit: iter(articles))
+    monkeypatch.setattr(daily, "load_config", lambda: {})
+
+    try:
+        paths = daily.run_daily(out_root=tmp_path / "outputs")
+    finally:
+        instrumentation.stop_run()
+        models.unload_model("all-mpnet-base-v2")
+
+    report = json.loads((paths["wav"].parent / "run_report.json").read_text())
+    # The model was already loaded, so there is no model_load stage
+    assert list(report["stages"]) == [
+        "fetch", "embed", "topics", "features", "intent",
+        "midi", "wav.synth", "wav", "explanation",
+    ]
+    assert report["stages"]["fetch"]["items"] == 12
+    assert report["stages"]["embed"]["items"] == 12
+    assert all(
+        stats["peak_rss_growth_bytes"] >= 0 for stats in report["stages"].values()
+    )
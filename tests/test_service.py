@@ -0,0 +1,226 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+import types
+import urllib.error
+import urllib.request
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import music_of_the_day
+from music_of_the_day.music import render
+from music_of_the_day.semantics.storage.article_index import ArticleIndex
+from music_of_the_day.semantics.storage.articles import save_articles
+from music_of_the_day.service import GenerationService, make_server
+
+
+def _articles(seed: int, n: int = 12) -> list[str]:
+    rng = np.random.default_rng(seed)
+    words = [f"word{i}" for i in range(200)]
+    return [" ".join(rng.choice(words, size=15)) for _ in range(n)]
+
+
+def _post(base: str, body: bytes):
+    request = urllib.request.Request(f"{base}/generate", data=body, method="POST")
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+class _StubService:
+    def generate(self, articles=None, day=None):
+        if day == date(1999, 1, 1):
+            raise LookupError("No archived articles for 1999-01-01")
+        return {"articles": articles, "day": day.isoformat() if day else None}
+
+
+def test_service_endpoints():
+    server = make_server(_StubService(), port=0, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        with urllib.request.urlopen(f"{base}/health") as response:
+            assert json.loads(response.read())["status"] == "ok"
+
+        expected = {"articles": ["a", "b"], "day": None}
+        assert _post(base, b'{"articles": ["a", "b"]}') == (200, expected)
+        assert _post(base, b'{"date": "2024-06-01"}')[1]["day"] == "2024-06-01"
+        assert _post(base, b"not json")[0] == 400
+        assert _post(base, b"{}")[0] == 400
+        assert _post(base, b'{"articles": "a"}')[0] == 400
+        assert _post(base, b'{"date": "1999-01-01"}')[0] == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_generate_renders_each_request_into_its_own_directory(
+    tmp_path, monkeypatch, stub_model
+):
+    monkeypatch.chdir(tmp_path)
+    day = date(2024, 6, 1)
+    texts = _articles(0)
+    embeddings = stub_model.encode(texts)
+    save_articles(embeddings, texts, day)
+    index = ArticleIndex()
+    index.add(embeddings, day)
+    index.save()
+
+    service = GenerationService(quality="preview", model_name="stub")
+    service.preload()
+    preloaded = service.article_index
+
+    by_articles = service.generate(articles=_articles(1), day=date(2024, 6, 2))
+    by_date = [service.generate(day=day) for _ in range(2)]
+
+    out_dirs = set()
+    for result in [by_articles, *by_date]:
+        wav = Path(result["paths"]["wav"])
+        assert wav.stat().st_size > 0
+        assert wav.parent.parent == Path("outputs") / "requests"
+        assert wav.parent.name.startswith(result["day"])
+        out_dirs.add(wav.parent)
+    assert len(out_dirs) == 3
+    assert not (Path("outputs") / day.isoformat()).exists()
+
+    # The preloaded index is searched, never extended or saved
+    assert service.article_index is preloaded
+    assert len(preloaded) == len(ArticleIndex()) == len(texts)
+
+    with pytest.raises(LookupError):
+        service.generate(day=date(2024, 5, 1))
+
+
+class _FakeSynth:
+    """
+    Just enough of fluidsynth.Synth to render silence, counting
+    SoundFont loads.
+    """
+    instances: list["_FakeSynth"] = []
+
+    def __init__(self, gain: float, samplerate: float):
+        self.loads = 0
+        _FakeSynth.instances.append(self)
+
+    def sfload(self, path: str) -> int:
+        self.loads += 1
+        return 1
+
+    def get_samples(self, n: int) -> np.ndarray:
+        return np.zeros(2 * n, dtype=np.int16)
+
+    def program_select(self, *args):
+        pass
+
+    def noteon(self, *args):
+        pass
+
+    def noteoff(self, *args):
+        pass
+
+    def all_sounds_off(self, channel: int):
+        pass
+
+    def delete(self):
+        pass
+
+
+def test_preloaded_soundfont_is_reused_across_requests(
+    tmp_path, monkeypatch, stub_model
+):
+    monkeypatch.chdir(tmp_path)
+    fluidsynth = types.ModuleType("fluidsynth")
+    fluidsynth.Synth = _FakeSynth
+    monkeypatch.setitem(sys.modules, "fluidsynth", fluidsynth)
+    monkeypatch.setattr(_FakeSynth, "instances", [])
+    monkeypatch.setattr(render, "_SYNTHS", {})
+    soundfont = tmp_path / "test.sf2"
+    soundfont.write_bytes(b"sf2")
+
+    service = GenerationService(soundfont_path=str(soundfont), model_name="stub")
+    service.preload()
+    for seed in (1, 2):  # different articles, so the render cache cannot hit
+        result = service.generate(articles=_articles(seed))
+        assert Path(result["paths"]["wav"]).stat().st_size > 0
+
+    assert [synth.loads for synth in _FakeSynth.instances] == [1]
+
+
+_SERVE_SCRIPT = textwrap.dedent("""
+    import sys
+    import types
+
+    from music_of_the_day.service import serve
+
+    def set_num_threads(n):
+        print(f"torch threads: {n}", flush=True)
+
+    sys.modules["torch"] = types.SimpleNamespace(set_num_threads=set_num_threads)
+
+    class Service:
+        def preload(self):
+            pass
+
+    serve(Service(), port=0, workers=2)
+""")
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-forking needs os.fork")
+def test_serve_respawns_workers_and_forwards_sigterm(tmp_path):
+    src = str(Path(music_of_the_day.__file__).parents[1])
+    pythonpath = os.pathsep.join([src, os.environ.get("PYTHONPATH", "")])
+    proc = subprocess.Popen(
+        [sys.executable, "-u", "-c", _SERVE_SCRIPT],
+        cwd=tmp_path,
+        env={**os.environ, "PYTHONPATH": pythonpath},
+        stdout=subprocess.PIPE,
+        text=True
+    )
+    lines = []
+
+    def read_output():
+        for line in proc.stdout:
+            lines.append(line)
+
+    def wait_for(text: str):
+        deadline = time.monotonic() + 10
+        while not any(text in line for line in lines):
+            assert time.monotonic() < deadline, f"never printed {text!r}: {lines}"
+            time.sleep(0.05)
+        return next(line for line in lines if text in line)
+
+    def health() -> int:
+        with urllib.request.urlopen(f"{base}/health", timeout=5) as response:
+            return json.loads(response.read())["pid"]
+
+    threading.Thread(target=read_output, daemon=True).start()
+    try:
+        base = wait_for("with 2 workers").split()[3]
+        threads = max(1, (os.cpu_count() or 1) // 2)
+        wait_for(f"torch threads: {threads}")
+
+        worker = health()
+        assert worker != proc.pid
+        os.kill(worker, signal.SIGKILL)
+        wait_for(f"Worker {worker} exited, starting a replacement")
+        assert health() != worker
+
+        proc.send_signal(signal.SIGTERM)
+        assert proc.wait(timeout=10) == 0
+        with pytest.raises(urllib.error.URLError):
+            health()
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
@@ -0,0 +1,275 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from music_of_the_day.semantics.storage import state
+from music_of_the_day.semantics.storage.state import DayState, StateStore
+
+
+def test_state_store_rolling_windows_match_full_recompute(tmp_path, monkeypatch):
+    monkeypatch.setattr(state, "ROLLING_WINDOWS", (3, 7))
+    rng = np.random.default_rng(0)
+    start = date(2024, 5, 1)
+    stored = {}
+
+    with StateStore(tmp_path / "state.db") as store:
+        # In-order days, a gap, a same-day re-run and a late backfilled day
+        for offset in [0, 1, 2, 3, 4, 5, 9, 10, 10, 7]:
+            day = start + timedelta(days=offset)
+            stored[day] = rng.random(8).astype(np.float32)
+            store.save_day(DayState(day=day, embedding=stored[day]))
+
+        today = start + timedelta(days=11)
+        assert store.rolling_anchor() == today - timedelta(days=1)
+        for n in (3, 5, 7):  # 5 is not a kept window: read from the days
+            window = [v for d, v in stored.items() if today - d <= timedelta(days=n)]
+            np.testing.assert_allclose(
+                store.rolling_average(today, n)[0], np.mean(window, axis=0), rtol=1e-5
+            )
+
+        # Dropping a day's embedding takes it out of the windows
+        store.save_day(DayState(day=start + timedelta(days=10)))
+        del stored[start + timedelta(days=10)]
+        window = [v for d, v in stored.items() if today - d <= timedelta(days=3)]
+        np.testing.assert_allclose(
+            store.rolling_average(today, 3)[0], np.mean(window, axis=0), rtol=1e-5
+        )
+        assert store.rolling_average(start, 3) is None
+
+
+def test_state_store_ema_replaces_a_rerun_day(tmp_path):
+    d1, d2 = date(2024, 1, 1), date(2024, 1, 2)
+    with StateStore(tmp_path / "state.db") as store:
+        assert store.rolling_ema() is None
+        store.save_day(DayState(day=d1, embedding=np.full(4, 1.0)))
+        store.save_day(DayState(day=d2, embedding=np.full(4, 2.0)))
+        np.testing.assert_allclose(store.rolling_ema(), [[1.2] * 4])
+
+        store.save_day(DayState(day=d2, embedding=np.full(4, 6.0)))  # re-run
+        np.testing.assert_allclose(store.rolling_ema(), [[2.0] * 4])
+        store.save_day(DayState(day=d1, embedding=np.full(4, 9.0)))  # older day
+        np.testing.assert_allclose(store.rolling_ema(), [[2.0] * 4])
+
+
+def test_article_index_nearest_neighbour_and_persistence(tmp_path):
+    from music_of_the_day.semantics.storage.article_index import (
+        ArticleIndex,
+        compute_archive_novelty,
+    )
+
+    rng = np.random.default_rng(0)
+    start = date(2024, 1, 1)
+    days = [rng.normal(size=(200, 32)) for _ in range(5)]
+
+    index = ArticleIndex(tmp_path, nprobe=64)
+    for offset, vectors in enumerate(days):
+        index.add(vectors, start + timedelta(days=offset))
+    index.add(days[-1], start + timedelta(days=4))  # re-run replaces the day
+    assert len(index) == 1000
+
+    # Exact nearest neighbours when every list is probed
+    queries = rng.normal(size=(20, 32))
+    archive = np.vstack(days)
+    archive /= np.linalg.norm(archive, axis=1, keepdims=True)
+    units = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    expected = 1.0 - (units @ archive.T).max(axis=1)
+    np.testing.assert_allclose(index.search(queries), expected, atol=1e-5)
+
+    index.save()
+    reloaded = ArticleIndex(tmp_path)
+    assert len(reloaded) == 1000
+
+    # A stored article is not novel; only earlier days count against it
+    repeat = days[2][:10]
+    assert compute_archive_novelty(repeat, reloaded, start + timedelta(days=3)) < 1e-5
+    assert compute_archive_novelty(repeat, reloaded, start + timedelta(days=2)) > 0.1
+    assert compute_archive_novelty(repeat, reloaded, start) is None
+
+
+def test_article_index_appends_days_and_ignores_uncommitted_rows(tmp_path, capsys):
+    import json
+
+    from music_of_the_day.semantics.storage.article_index import ArticleIndex
+
+    rng = np.random.default_rng(0)
+    d0, d1, d2 = date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 3)
+    row_bytes = 16 * 4
+
+    index = ArticleIndex(tmp_path)
+    index.add(rng.normal(size=(400, 16)), d0)  # trains the quantizer
+    index.save()
+    (vectors_file,) = tmp_path.glob("vectors-*.f32")
+    assert vectors_file.stat().st_size == 400 * row_bytes
+
+    # A new day only appends its own rows
+    index.add(rng.normal(size=(50, 16)), d1)
+    index.save()
+    assert vectors_file.stat().st_size == 450 * row_bytes
+
+    # Re-running a day appends the new rows and retires the old ones
+    rerun = rng.normal(size=(50, 16))
+    index.add(rerun, d1)
+    index.save()
+    reloaded = ArticleIndex(tmp_path)
+    assert len(reloaded) == 450
+    assert reloaded.search(rerun, nprobe=64).max() < 1e-5
+
+    # Rows appended by a save that crashed before meta.json are ignored
+    with open(vectors_file, "ab") as f:
+        f.write(b"\0" * 10 * row_bytes)
+    reloaded = ArticleIndex(tmp_path)
+    assert len(reloaded) == 450
+    reloaded.add(rng.normal(size=(50, 16)), d2)
+    reloaded.save()
+    assert vectors_file.stat().st_size == 550 * row_bytes
+    assert len(ArticleIndex(tmp_path)) == 500
+
+    # meta.json counting rows the files do not hold is rejected
+    meta_path = tmp_path / "meta.json"
+    meta = json.loads(meta_path.read_text())
+    meta["rows"] += 1000
+    meta_path.write_text(json.dumps(meta))
+    assert len(ArticleIndex(tmp_path)) == 0
+    assert "incomplete" in capsys.readouterr().out
+
+
+def test_article_archive_quantized_roundtrip(tmp_path, monkeypatch):
+    from music_of_the_day.semantics.storage import articles
+
+    monkeypatch.setattr(articles, "BASE_DIR", tmp_path)
+    rng = np.random.default_rng(1)
+    day = date(2024, 2, 1)
+    embeddings = rng.normal(size=(100, 384)).astype(np.float32)
+    texts = [f"article {i}" for i in range(100)]
+
+    # Batches arrive separately and are quantized on arrival
+    writer = articles.ArticleArchiveWriter(day, fmt="int8")
+    writer.append(texts[:60], embeddings[:60])
+    writer.append(texts[60:], embeddings[60:])
+    path = writer.save()
+
+    # int8 codes + one float32 scale per row: under a third of float32
+    assert path.stat().st_size < embeddings.nbytes / 3
+
+    archived = articles.load_articles(day)
+    assert archived.ids[0] == "2024-02-01:0" and archived.ids[-1] == "2024-02-01:99"
+    assert archived.text_hashes[5] == articles.hash_article("article 5")
+    cosine = np.einsum("ij,ij->i", archived.embeddings, embeddings) / (
+        np.linalg.norm(archived.embeddings, axis=1) * np.linalg.norm(embeddings, axis=1)
+    )
+    assert cosine.min() > 0.999
+
+    articles.save_articles(embeddings, texts, day + timedelta(days=1), fmt="float16")
+    np.testing.assert_allclose(
+        articles.load_articles(day + timedelta(days=1)).embeddings,
+        embeddings,
+        atol=1e-2
+    )
+    assert [d for d, _ in articles.iter_archive(start=day + timedelta(days=1))] == [
+        day + timedelta(days=1)
+    ]
+    assert articles.load_articles(day - timedelta(days=1)) is None
+
+
+def test_article_archive_save_is_atomic(tmp_path, monkeypatch):
+    from music_of_the_day.semantics.storage import articles
+
+    monkeypatch.setattr(articles, "BASE_DIR", tmp_path)
+    day = date(2024, 2, 1)
+    embeddings = np.ones((3, 8), dtype=np.float32)
+    articles.save_articles(embeddings, ["a", "b", "c"], day)
+
+    # A save that dies mid-write leaves the previous archive readable
+    def crash(f, **arrays):
+        f.write(b"PK\x03\x04 truncated")
+        raise OSError("disk full")
+
+    monkeypatch.setattr(articles.np, "savez", crash)
+    with pytest.raises(OSError):
+        articles.save_articles(embeddings[:1], ["d"], day)
+
+    assert len(articles.load_articles(day).ids) == 3
+    assert articles.archived_days() == [day]
+
+
+def test_state_store_days_latest_and_range(tmp_path):
+    from music_of_the_day.semantics.emotion import EmotionState
+
+    start = date(2024, 6, 1)
+    with StateStore(tmp_path / "state.db") as store:
+        for offset in (0, 1, 3):
+            store.save_day(DayState(
+                day=start + timedelta(days=offset),
+                embedding=np.full(8, float(offset)),
+                velocity=0.1 * offset,
+                emotion=EmotionState(valence=0.0, arousal=0.5, tension=0.2),
+                centroids=np.ones((4, 8)) * offset
+            ))
+        # Re-running a day replaces its row
+        store.save_day(DayState(
+            day=start + timedelta(days=1), embedding=np.full(8, 9.0), velocity=0.9
+        ))
+
+    with StateStore(tmp_path / "state.db") as store:
+        latest = store.load_latest()
+        assert latest.day == start + timedelta(days=3)
+        assert latest.centroids.shape == (4, 8)
+        assert latest.emotion.arousal == 0.5
+
+        before = store.load_latest(before=start + timedelta(days=3))
+        assert before.day == start + timedelta(days=1)
+        assert before.velocity == 0.9 and before.emotion is None
+
+        days = store.load_range(start, start + timedelta(days=2))
+        assert [d.day for d in days] == [start, start + timedelta(days=1)]
+        np.testing.assert_allclose(days[1].embedding, 9.0)
+        assert store.load_day(start + timedelta(days=2)) is None
+
+        # Rolling average of the days before, straight from the store
+        after = start + timedelta(days=4)
+        np.testing.assert_allclose(store.rolling_average(after), [[4.0] * 8])
+        np.testing.assert_allclose(store.rolling_average(after, n=1), [[3.0] * 8])
+        assert store.rolling_average(start) is None
+
+
+def test_legacy_files_migrate_into_state_store(tmp_path, monkeypatch):
+    import json
+
+    from music_of_the_day.semantics.emotion import EmotionState
+    from music_of_the_day.semantics.storage import emotion, velocity
+
+    for module in (emotion, velocity):
+        name = module.__name__.rsplit(".", 1)[-1]
+        monkeypatch.setattr(module, "BASE_DIR", tmp_path / name)
+        module.BASE_DIR.mkdir()
+    monkeypatch.setattr(state, "LEGACY_TOPICS_DIR", tmp_path / "topics")
+    state.LEGACY_TOPICS_DIR.mkdir()
+
+    monkeypatch.setattr(state, "LEGACY_EMBEDDINGS_DIR", tmp_path / "rolling")
+    state.LEGACY_EMBEDDINGS_DIR.mkdir()
+
+    # d1 as a per-day .npy, d2 and d3 in the memory-mapped history matrix
+    d1, d2, d3 = date(2024, 1, 1), date(2024, 1, 2), date(2024, 1, 3)
+    np.save(state.LEGACY_EMBEDDINGS_DIR / f"{d1.isoformat()}.npy", np.full(4, 1.0))
+    np.save(state.LEGACY_EMBEDDINGS_DIR / "latest.npy", np.full(4, 1.0))
+    history = np.array([[2.0] * 4, [3.0] * 4], dtype=np.float32)
+    history.tofile(state.LEGACY_EMBEDDINGS_DIR / "history.f32")
+    (state.LEGACY_EMBEDDINGS_DIR / "index.json").write_text(json.dumps(
+        {"dim": 4, "days": [d2.toordinal(), d3.toordinal()], "latest": d3.toordinal()}
+    ))
+    velocity.save_velocity(0.25, d2)
+    emotion.save_emotion(EmotionState(valence=0.1, arousal=0.2, tension=0.3), d2)
+    np.save(state.LEGACY_TOPICS_DIR / f"{d2.isoformat()}.npy", np.zeros((2, 4)))
+
+    with state.StateStore(tmp_path / "state.db") as store:
+        assert state.migrate_legacy_state(store) == 3
+        first, second, third = store.load_range(d1, d3)
+        np.testing.assert_allclose(store.rolling_average(d3 + timedelta(days=1)), 2.0)
+
+    np.testing.assert_allclose(first.embedding, 1.0)
+    np.testing.assert_allclose(third.embedding, 3.0)
+    assert first.velocity is None
+    assert second.velocity == 0.25
+    assert second.emotion.tension == 0.3
+    assert second.centroids.shape == (2, 4)